@@ -1,42 +1,59 @@
 # backend/app/api/chat.py
 
-from fastapi import APIRouter, BackgroundTasks
+import asyncio
+import os
+from fastapi import APIRouter
 from pydantic import BaseModel
 
-# Import the ingestion service (make sure you created the file from the previous step)
-from ..rag.ingest import ingest_news_for_ticker
 from ..rag.chat_chain import run_chat
-from ..rag.vector_store import retrieve
-from ..tasks import task_ingest_news
+from ..rag.vector_store import count_documents
+from ..tasks import schedule_ingest, wait_for_task
+from ..services.metrics import span, timing_breakdown
+from ..services.hot_tickers import record_request
 
 router = APIRouter()
 
+# How long a cold (never ingested) ticker waits for its first news ingestion
+INGEST_WAIT_SECONDS = float(os.getenv("INGEST_WAIT_SECONDS", "30"))
+
 class ChatReq(BaseModel):
     user_input: str
     ticker: str | None = None
     horizon_days: int = 7
+    include_timing: bool = False
 
 @router.post("/api/chat")
-async def api_chat(req: ChatReq, background_tasks: BackgroundTasks):
+async def api_chat(req: ChatReq):
     """
     Main chat endpoint.
-    1. Triggers background news ingestion (non-blocking).
-    2. Runs the RAG/LLM chain immediately using *existing* data.
+    1. Enqueues news ingestion only when the ticker's news is stale, at most one at a time.
+    2. For a ticker with no news yet, awaits the ingestion without blocking the event loop.
+       If it does not finish in time, answers with fundamentals and forecast only.
+    3. Runs the RAG/LLM chain.
+    4. Counts the request towards the ticker's popularity (see services/refresher.py).
     """
     if req.ticker:
         ticker = req.ticker.upper()
         collection_name = f"news_{ticker.lower()}"
-        existing_docs = retrieve(query=ticker, collection=collection_name)
-        if not existing_docs:
-            print(f"No existing news for {ticker}.")
-            task = task_ingest_news.apply_async(args=[ticker])
-            result = task.get(timeout=30)
-        else:
-            print(f"Existing news found for {ticker}, refreshing ingestion.")
-            task_ingest_news.delay(ticker)
-        
-    return await run_chat(
+        has_docs = await asyncio.to_thread(count_documents, collection_name) > 0
+
+        task = schedule_ingest(ticker, force=not has_docs)
+        if not has_docs and task is not None:
+            print(f"No existing news for {ticker}, waiting for ingestion.")
+            with span("wait_for_ingest"):
+                ready = await wait_for_task(task, timeout=INGEST_WAIT_SECONDS)
+            if not ready:
+                print(f"Ingestion for {ticker} not ready, answering without news.")
+        elif task is not None:
+            print(f"News for {ticker} is stale, refreshing in background.")
+
+    result = await run_chat(
         user_input=req.user_input,
         ticker=req.ticker,
         horizon_days=req.horizon_days
-    )
\ No newline at end of file
+    )
+    if req.ticker and "error" not in (result.get("fundamentals") or {}):
+        record_request(req.ticker)
+    if req.include_timing:
+        result["timing"] = timing_breakdown()
+    return result
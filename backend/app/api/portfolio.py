@@ -0,0 +1,51 @@
+# backend/app/api/portfolio.py
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from ..rag.portfolio_chain import run_portfolio
+from ..services.portfolio import MAX_PORTFOLIO_TICKERS, normalize_weights
+from ..services.metrics import timing_breakdown
+from ..services.hot_tickers import record_request
+
+router = APIRouter()
+
+class Holding(BaseModel):
+    ticker: str
+    weight: float | None = None
+
+class PortfolioReq(BaseModel):
+    holdings: list[Holding]
+    user_input: str | None = None
+    horizon_days: int = 7
+    include_timing: bool = False
+
+@router.post("/api/portfolio")
+async def api_portfolio(req: PortfolioReq):
+    """
+    Portfolio / watchlist endpoint.
+    Without `user_input` it returns per-holding data and portfolio aggregates;
+    with it, also one LLM answer over the whole basket.
+    """
+    tickers = {h.ticker.strip().upper() for h in req.holdings if h.ticker.strip()}
+    if not tickers:
+        raise HTTPException(status_code=400, detail="At least one ticker is required.")
+    if len(tickers) > MAX_PORTFOLIO_TICKERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_PORTFOLIO_TICKERS} tickers per portfolio.")
+    if any(h.weight is not None and h.weight < 0 for h in req.holdings):
+        raise HTTPException(status_code=400, detail="Weights must be non-negative.")
+
+    holdings = [h.model_dump() for h in req.holdings if h.ticker.strip()]
+    try:
+        weights = normalize_weights(holdings)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    result = await run_portfolio(weights, user_input=req.user_input, horizon_days=req.horizon_days)
+    for t in result["tickers"]:
+        if "error" not in (result["holdings"][t]["fundamentals"] or {}):
+            record_request(t)
+
+    if req.include_timing:
+        result["timing"] = timing_breakdown()
+    return result
@@ -1,13 +1,46 @@
 # backend/app/api_report.py
 
 import asyncio
+import hashlib
+import json
 from ..services.data_fetcher import fetch_fundamentals, fetch_price_history, fetch_news_docs
 from ..services.sentiment import compute_sentiment
-from ..services.predictor import predict_prices
+from ..services.predictor import get_forecast
+from ..services.indicators import get_indicators, latest_indicators
+from ..services.cache import get_cache, set_cache
+from ..services.metrics import traced
 from datetime import datetime
 
-async def generate_report(ticker: str, horizon_days: int = 7):
+# Snapshots are keyed by data version, so the TTL only bounds Redis memory
+REPORT_SNAPSHOT_TTL = 3600
+
+REPORT_FIELDS = {"ticker", "generated_at", "data_version", "fundamentals", "price_history", "news_docs", "sentiment", "prediction", "technicals"}
+
+def compute_data_version(fundamentals, price_history, news_docs):
+    """
+    Short hash of the report inputs. Changes when fundamentals change,
+    a new price bar arrives or the news set changes.
+    """
+    payload = json.dumps(
+        [fundamentals, len(price_history), price_history[-1:], [n.get("url") for n in news_docs]],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+def project_report(report: dict, fields):
+    """Keeps only the requested top-level fields (ticker and data_version are always kept)."""
+    if not fields:
+        return report
+    keep = set(fields) | {"ticker", "data_version"}
+    return {k: v for k, v in report.items() if k in keep}
 
+@traced("report_inputs")
+async def load_report_inputs(ticker: str):
+    """
+    Fetches the report inputs (cached upstream, so cheap) and their data version.
+    Enough to answer a conditional request before build_report runs FinBERT and XGBoost.
+    """
     fund_task = asyncio.create_task(fetch_fundamentals(ticker))
     price_task = asyncio.create_task(fetch_price_history(ticker))
     news_task = asyncio.create_task(fetch_news_docs(ticker))
@@ -16,15 +49,44 @@ async def generate_report(ticker: str, horizon_days: int = 7):
     price_history = await price_task
     news_docs = await news_task
 
+    return {
+        "fundamentals": fundamentals,
+        "price_history": price_history,
+        "news_docs": news_docs,
+        "data_version": compute_data_version(fundamentals, price_history, news_docs),
+    }
+
+@traced("build_report")
+async def build_report(ticker: str, horizon_days: int, inputs: dict):
+    """Full report for inputs from load_report_inputs, served from the snapshot cache when possible."""
+    fundamentals = inputs["fundamentals"]
+    price_history = inputs["price_history"]
+    news_docs = inputs["news_docs"]
+    data_version = inputs["data_version"]
+
+    # On a snapshot hit we skip FinBERT and XGBoost
+    snapshot_key = f"report_{ticker.upper()}_{horizon_days}_{data_version}"
+    snapshot = get_cache(snapshot_key)
+    if snapshot:
+        return snapshot
+
     sentiment = compute_sentiment(news_docs)
-    prediction = await predict_prices(price_history, horizon_days)
+    prediction = await get_forecast(price_history, horizon_days, ticker=ticker)
 
-    return {
+    report = {
         "ticker": ticker.upper(),
         "generated_at": datetime.utcnow().isoformat() + "Z",
+        "data_version": data_version,
         "fundamentals": fundamentals,
         "price_history": price_history,
         "news_docs": news_docs,
         "sentiment": sentiment,
         "prediction": prediction,
+        "technicals": latest_indicators(get_indicators(price_history, ticker)),
     }
+    set_cache(snapshot_key, report, expire=REPORT_SNAPSHOT_TTL)
+    return report
+
+@traced("generate_report")
+async def generate_report(ticker: str, horizon_days: int = 7):
+    return await build_report(ticker, horizon_days, await load_report_inputs(ticker))
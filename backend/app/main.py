@@ -1,9 +1,27 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import time
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 import os
-from .api.report import generate_report
+from .api.report import load_report_inputs, build_report, project_report, REPORT_FIELDS
 from fastapi.middleware.cors import CORSMiddleware
 from .api.chat import router as chat_router
+from .api.portfolio import router as portfolio_router
+from .celery_app import get_queue_depths
+from .rag.vector_store import RERANK_ENABLED, preload_cross_encoder
+from .services.hot_tickers import record_request
+from .services.refresher import refresher_status
+from .services.metrics import (
+    HTTP_LATENCY, QUEUE_DEPTH, REFRESHER_LAST_CYCLE, REFRESHER_TOTALS, HOT_CACHE_COLD, HOT_CACHE_MIN_TTL,
+    metrics_payload, start_timing, timing_breakdown,
+)
+
+try:
+    # Serves br when the client accepts it and falls back to gzip otherwise
+    from brotli_asgi import BrotliMiddleware as CompressionMiddleware
+except ImportError:
+    from fastapi.middleware.gzip import GZipMiddleware as CompressionMiddleware
 
 app = FastAPI(
     title="InsightInvest API",
@@ -24,23 +42,91 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+app.add_middleware(CompressionMiddleware, minimum_size=1000)
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start_timing()
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    path = route.path if route else "unmatched"
+    HTTP_LATENCY.labels(request.method, path, response.status_code).observe(time.perf_counter() - start)
+    return response
+
+
+@app.on_event("startup")
+async def warm_up_models():
+    if RERANK_ENABLED:
+        preload_cross_encoder()
+
 
 class ReportRequest(BaseModel):
     ticker: str
     horizon_days: int=7
+    # Optional projection, e.g. ["fundamentals", "sentiment", "prediction"] to skip the heavy arrays
+    fields: list[str] | None = None
+    include_timing: bool = False
     
 @app.post("/api/report")
-async def report(req:ReportRequest):
+async def report(req:ReportRequest, request: Request):
     ticker = req.ticker.strip().upper()
     if not ticker:
         raise HTTPException(status_code=400, detail="Ticker symbol is required.")
-    report = await generate_report(ticker, req.horizon_days)
-    return report
+    unknown = set(req.fields or []) - REPORT_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown report fields: {sorted(unknown)}")
+
+    inputs = await load_report_inputs(ticker)
+    if "error" not in (inputs["fundamentals"] or {}):
+        # Invalid tickers never become hot, so the refresher doesn't spend quota on them
+        record_request(ticker)
+
+    # The ETag only depends on the inputs, so revalidation never pays for a rebuild
+    projection = ",".join(sorted(req.fields)) if req.fields else "all"
+    etag = f'W/"{inputs["data_version"]}-{req.horizon_days}-{projection}"'
+    if etag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    report = await build_report(ticker, req.horizon_days, inputs)
+    body = project_report(report, req.fields)
+    if req.include_timing:
+        body = {**body, "timing": timing_breakdown()}
+    return JSONResponse(body, headers={"ETag": etag})
+
+@app.get("/metrics")
+async def metrics():
+    try:
+        depths = await asyncio.wait_for(asyncio.to_thread(get_queue_depths), timeout=2)
+        for queue, depth in depths.items():
+            if depth is not None:
+                QUEUE_DEPTH.labels(queue).set(depth)
+    except Exception as e:
+        print(f"Could not read queue depths: {e!r}")
+
+    try:
+        status = await asyncio.wait_for(asyncio.to_thread(refresher_status), timeout=2)
+        if status:
+            for field, value in status["last_cycle"].items():
+                REFRESHER_LAST_CYCLE.labels(field).set(value)
+            for source, entry in status["entries"].items():
+                HOT_CACHE_COLD.labels(source).set(entry["cold"])
+                if entry["min_ttl"] is not None:
+                    HOT_CACHE_MIN_TTL.labels(source).set(entry["min_ttl"])
+            REFRESHER_TOTALS.totals = status["totals"]
+    except Exception as e:
+        print(f"Could not read refresher status: {e!r}")
+
+    payload, content_type = metrics_payload()
+    return Response(content=payload, media_type=content_type)
 
 @app.get("/health")
 async def health_check():
     return {"status": "ok","fake_data": os.getenv("FAKE_DATA","0")} 
 
-app.include_router(chat_router)
\ No newline at end of file
+app.include_router(chat_router)
+app.include_router(portfolio_router)
\ No newline at end of file
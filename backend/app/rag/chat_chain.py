@@ -6,7 +6,9 @@ from .vector_store import retrieve
 from .gemini_llm import get_gemini_llm
 from ..services.data_fetcher import fetch_fundamentals, fetch_price_history
 from ..services.sentiment import compute_sentiment
-from ..services.predictor import predict_prices, generate_chart_data
+from ..services.predictor import get_forecast, generate_chart_data
+from ..services.indicators import get_indicators, latest_indicators
+from ..services.metrics import span, traced
 
 # --------------------------------------
 # Helper: Format retrieved documents
@@ -26,9 +28,27 @@ def format_docs(docs):
         out.append(f"[{i}] {title} ({source})\n    Snippet: {snippet}...")
     return "\n\n".join(out)
 
+# --------------------------------------
+# Helper: Extract the JSON text from a Gemini response
+# --------------------------------------
+def parse_llm_reply(resp):
+    reply = getattr(resp, "text", "")
+    if not reply and hasattr(resp, "content"):
+        reply = resp.content
+    if isinstance(reply, list):
+        reply = reply[0].text
+        
+    reply = reply.strip()
+    if reply.startswith("```"):
+        reply = reply.split("```")[1]
+        if reply.startswith("json"):
+            reply = reply[4:]
+    return reply.strip()
+
 # --------------------------------------
 # Main Chat Function
 # --------------------------------------
+@traced("run_chat")
 async def run_chat(user_input, ticker=None, horizon_days=7):
     # Normalize Ticker
     ticker = ticker.upper() if ticker else None
@@ -36,9 +56,11 @@ async def run_chat(user_input, ticker=None, horizon_days=7):
     # -----------------------------
     # 1) Retrieve News (Context)
     # -----------------------------
+    # Search with the user's actual question; the collection already scopes it to the ticker
     collection = f"news_{ticker.lower()}" if ticker else "news"
-    retrieved_docs = retrieve(
-        user_input if not ticker else ticker,
+    retrieved_docs = await asyncio.to_thread(
+        retrieve,
+        user_input,
         k=5,
         collection=collection
     )
@@ -55,12 +77,15 @@ async def run_chat(user_input, ticker=None, horizon_days=7):
         
         # Run sentiment & prediction
         sentiment = compute_sentiment([d.metadata for d in retrieved_docs])
-        prediction = await predict_prices(price_history, horizon_days)
+        prediction = await get_forecast(price_history, horizon_days, ticker=ticker)
         
         # Generate Chart Data (History + Forecast)
-        chart_data = generate_chart_data(price_history, prediction)
+        chart_data = generate_chart_data(price_history, prediction, ticker=ticker)
+
+        # Latest indicator values (per-ticker indicator cache, shared with the forecast)
+        technicals = latest_indicators(get_indicators(price_history, ticker))
     else:
-        fundamentals, price_history, sentiment, prediction, chart_data = {}, [], {}, {}, []
+        fundamentals, price_history, sentiment, prediction, chart_data, technicals = {}, [], {}, {}, [], {}
 
     # -----------------------------
     # 3) The "Professional" Prompt
@@ -83,6 +108,8 @@ Your goal is to synthesize complex financial data into a clear, professional nar
 {prediction}
 *(Note: The model provides a 7-day technical forecast with 90% confidence intervals. 'forecast_range_low/high' indicates volatility risk.)*
 
+Technical indicators (latest bar): {technicals}
+
 **4. RECENT NEWS (Sources):**
 {format_docs(retrieved_docs)}
 
@@ -126,20 +153,10 @@ Respond ONLY with this JSON structure. Do not add markdown outside the JSON.
     # 4) Execute Reasoning Engine
     # -----------------------------
     llm = get_gemini_llm()
-    resp = llm.invoke(context)
+    with span("gemini"):
+        resp = llm.invoke(context)
 
-    reply = getattr(resp, "text", "")
-    if not reply and hasattr(resp, "content"):
-        reply = resp.content
-    if isinstance(reply, list):
-        reply = reply[0].text
-        
-    reply = reply.strip()
-    if reply.startswith("```"):
-        reply = reply.split("```")[1]
-        if reply.startswith("json"):
-            reply = reply[4:]
-    reply = reply.strip()
+    reply = parse_llm_reply(resp)
 
     return {
         "reply": reply,
@@ -147,5 +164,6 @@ Respond ONLY with this JSON structure. Do not add markdown outside the JSON.
         "sentiment": sentiment,
         "prediction": prediction,
         "chart_data": chart_data,
+        "technicals": technicals,
         "sources": [d.metadata for d in retrieved_docs],
     }
\ No newline at end of file
@@ -2,8 +2,12 @@
 
 import os
 from langchain_google_genai import ChatGoogleGenerativeAI
+from ..services.fixtures import FAKE_DATA, StubLLM
 
 def get_gemini_llm():
+    if FAKE_DATA:
+        return StubLLM()
+
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         raise ValueError("GEMINI_API_KEY not set in .env")
@@ -15,6 +15,8 @@ async def ingest_news_for_ticker(ticker: str, limit: int = 25):
     docs, ids = docs_from_news(raw_news)
 
     count = ingest_documents(docs, ids, collection_name)
+    if count is None:
+        return {"status": "error", "details": f"Could not store news in '{collection_name}'"}
 
     return {
         "ticker": ticker,
@@ -0,0 +1,97 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Tickers ("BRK.B") and figures ("3.2B", "5%") stay single tokens; a leading "$" is dropped ("$3.2B" -> "3.2b").
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9.$%]*")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "how", "i", "in", "is", "it", "its", "of", "on", "or", "should", "that", "the",
+    "this", "to", "was", "what", "when", "which", "who", "will", "with", "my", "me",
+    "do", "does", "about", "stock", "stocks", "share", "shares",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    # Strip sentence-final dots before the stopword check, so "stock." is dropped like "stock"
+    tokens = (t.rstrip(".") for t in TOKEN_RE.findall((text or "").lower()))
+    return [t for t in tokens if t and t not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    In-process Okapi BM25 inverted index.
+    Documents are added incrementally; adding an existing id is a no-op.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._docs: Dict[str, Tuple[str, dict]] = {}
+        self._total_len = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._docs
+
+    def add(self, doc_id: str, text: str, metadata: Optional[dict] = None) -> bool:
+        with self._lock:
+            if doc_id in self._docs:
+                return False
+
+            tokens = tokenize(text)
+            for term, tf in Counter(tokens).items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+
+            self._docs[doc_id] = (text, metadata or {})
+            self._doc_len[doc_id] = len(tokens)
+            self._total_len += len(tokens)
+            return True
+
+    def add_documents(self, docs, ids) -> int:
+        """Adds LangChain Documents. Returns the number of new entries."""
+        return sum(self.add(doc_id, d.page_content, d.metadata) for d, doc_id in zip(docs, ids))
+
+    def get(self, doc_id: str) -> Optional[Tuple[str, dict]]:
+        return self._docs.get(doc_id)
+
+    def search(self, query: str, k: int = 20) -> List[Tuple[str, float]]:
+        terms = set(tokenize(query))
+        scores: Dict[str, float] = {}
+
+        # add() may run concurrently (retrieval runs in worker threads); score a consistent index
+        with self._lock:
+            n_docs = len(self._docs)
+            if not terms or not n_docs:
+                return []
+
+            avg_len = self._total_len / n_docs or 1.0
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k]
+
+_indexes: Dict[str, BM25Index] = {}
+_registry_lock = threading.Lock()
+
+
+def get_lexical_index(collection_name: str) -> BM25Index:
+    """Returns the process-wide BM25 index for a collection, creating it on first use."""
+    with _registry_lock:
+        if collection_name not in _indexes:
+            _indexes[collection_name] = BM25Index()
+        return _indexes[collection_name]
@@ -0,0 +1,160 @@
+import asyncio
+import os
+
+# Internal imports
+from .gemini_llm import get_gemini_llm
+from .chat_chain import parse_llm_reply
+from ..services.data_fetcher import fetch_fundamentals, fetch_price_history, fetch_news_docs
+from ..services.sentiment import compute_sentiment_batch
+from ..services.predictor import get_forecast
+from ..services.indicators import get_indicators, latest_indicators
+from ..services.portfolio import portfolio_aggregates
+from ..services.metrics import span, traced
+
+HEADLINES_PER_TICKER = 3
+
+# --------------------------------------
+# Helpers
+# --------------------------------------
+def _forecast_in_thread(price_history, horizon_days, ticker, n_jobs):
+    # XGBoost releases the GIL while fitting, so per-ticker threads overlap
+    return asyncio.run(get_forecast(price_history, horizon_days, ticker=ticker, model_params={"n_jobs": n_jobs}))
+
+def format_holding(ticker, weight, fundamentals, sentiment, prediction, technicals, news_docs):
+    """One compact line per holding, so the prompt stays small as the basket grows."""
+    parts = [f"- {ticker} (weight {weight * 100:.1f}%)"]
+
+    if fundamentals and "error" not in fundamentals:
+        trends = fundamentals.get("financial_trends") or {}
+        parts.append(f"{fundamentals.get('name')}, {fundamentals.get('sector')}")
+        parts.append(f"P/E {fundamentals.get('pe_ratio')}")
+        if "trend_direction" in trends:
+            parts.append(f"revenue {trends['trend_direction']} ({trends.get('revenue_growth_last_q')} QoQ)")
+
+    dist = sentiment.get("label_distribution") or {}
+    parts.append(f"sentiment {sentiment.get('average_sentiment', 0):+.2f} ({dist.get('positive', 0)}+/{dist.get('negative', 0)}-/{dist.get('neutral', 0)}=)")
+
+    if "forecast_7d" in prediction:
+        current = float(prediction["current_price"])
+        change = (prediction["forecast_7d"] / current - 1) * 100
+        parts.append(
+            f"forecast {prediction['forecast_7d']} ({change:+.2f}%, 90% range "
+            f"{prediction['forecast_range_low']}-{prediction['forecast_range_high']})"
+        )
+    if technicals:
+        parts.append(f"RSI {technicals.get('rsi', 0):.0f}, 5d vol {technicals.get('volatility', 0):.4f}")
+
+    headlines = [n["title"] for n in news_docs if isinstance(n, dict) and n.get("title")][:HEADLINES_PER_TICKER]
+    if headlines:
+        parts.append("news: " + "; ".join(headlines))
+
+    return " | ".join(parts)
+
+# --------------------------------------
+# Main Portfolio Function
+# --------------------------------------
+@traced("run_portfolio")
+async def run_portfolio(weights, user_input=None, horizon_days=7):
+    """`weights` is {ticker: weight} as returned by normalize_weights."""
+    tickers = list(weights)
+
+    # -----------------------------
+    # 1) Fetch everything concurrently
+    # -----------------------------
+    fetched = await asyncio.gather(*(
+        asyncio.gather(fetch_fundamentals(t), fetch_price_history(t), fetch_news_docs(t))
+        for t in tickers
+    ))
+    fundamentals = {t: f[0] for t, f in zip(tickers, fetched)}
+    price_histories = {t: f[1] for t, f in zip(tickers, fetched)}
+    news = {t: f[2] for t, f in zip(tickers, fetched)}
+
+    # -----------------------------
+    # 2) One FinBERT batch + parallel forecasts
+    # -----------------------------
+    n_jobs = max(1, (os.cpu_count() or 1) // len(tickers))
+    sentiment_task = asyncio.to_thread(compute_sentiment_batch, news)
+    forecast_tasks = [
+        asyncio.to_thread(_forecast_in_thread, price_histories[t], horizon_days, t, n_jobs)
+        for t in tickers
+    ]
+    sentiments, *forecasts = await asyncio.gather(sentiment_task, *forecast_tasks)
+    predictions = dict(zip(tickers, forecasts))
+
+    technicals = {t: latest_indicators(get_indicators(price_histories[t], t)) for t in tickers}
+    aggregates = portfolio_aggregates(weights, price_histories, predictions, sentiments)
+
+    result = {
+        "tickers": tickers,
+        "weights": {t: round(w, 4) for t, w in weights.items()},
+        "portfolio": aggregates,
+        "holdings": {
+            t: {
+                "fundamentals": fundamentals[t],
+                "sentiment": sentiments[t],
+                "prediction": predictions[t],
+                "technicals": technicals[t],
+            }
+            for t in tickers
+        },
+    }
+    if not user_input:
+        return result
+
+    # -----------------------------
+    # 3) One LLM call over a compact multi-ticker prompt
+    # -----------------------------
+    holding_lines = "\n".join(
+        format_holding(t, weights[t], fundamentals[t], sentiments[t], predictions[t], technicals[t], news[t])
+        for t in tickers
+    )
+    if aggregates["expected_return_pct"] is None:
+        forecast_line = f"{horizon_days}-day forecast return: unavailable (no holding has a forecast)"
+    else:
+        low, high = aggregates["expected_range_pct"]
+        forecast_line = (
+            f"{horizon_days}-day forecast return: {aggregates['expected_return_pct']}% "
+            f"(90% range {low}% to {high}%, correlation-adjusted; "
+            f"holdings with forecasts: {aggregates['forecast_coverage'] * 100:.0f}% of weight)"
+        )
+    context = f"""
+You are InsightInvest, a Senior Investment Strategist at a top-tier firm.
+Assess the user's portfolio as a whole, not as {len(tickers)} separate stock reviews.
+
+### HOLDINGS
+{holding_lines}
+
+### PORTFOLIO AGGREGATES
+- {forecast_line}
+- Weighted news sentiment: {aggregates['weighted_sentiment']}
+- Annualized volatility: {aggregates['annualized_volatility_pct']}% (holdings with prices: {aggregates['volatility_coverage'] * 100:.0f}% of weight)
+- Return correlation matrix: {aggregates['correlation']}
+
+### USER INQUIRY
+"{user_input}"
+
+### INSTRUCTIONS
+1. The first sentence of "analysis" must directly answer the question.
+2. Discuss concentration and diversification using the weights and correlations.
+3. Call out the holdings that drive most of the expected return and risk.
+4. Professional, objective tone. No "As an AI".
+
+### REQUIRED OUTPUT FORMAT (Strict JSON):
+Respond ONLY with this JSON structure. Do not add markdown outside the JSON.
+
+{{
+  "analysis": "Direct answer followed by a 3-4 sentence portfolio-level synthesis.",
+  "holding_notes": {{"TICKER": "One sentence per holding."}},
+  "diversification": "Comment on correlation and concentration.",
+  "risk_factors": "List 2-3 key portfolio risks.",
+  "confidence": "Low | Medium | High",
+  "disclaimer": "Not financial advice. For informational purposes only."
+}}
+"""
+
+    llm = get_gemini_llm()
+    with span("gemini"):
+        resp = await asyncio.to_thread(llm.invoke, context)
+
+    result["reply"] = parse_llm_reply(resp)
+    return result
@@ -1,17 +1,37 @@
 import os
+import time
 import hashlib
+import threading
 from typing import List, Dict
 from langchain_huggingface import HuggingFaceEndpointEmbeddings
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
 import chromadb
+from .lexical_index import get_lexical_index
+from ..services.metrics import span, traced
+from ..services.fixtures import FAKE_DATA, HashingEmbeddings
 
 CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", "chroma_db")
 
+# Hybrid retrieval settings
+RRF_K = 60
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "0") == "1"
+RERANK_MODEL = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "150"))
+RERANK_BATCH_SIZE = 8
+
+_cross_encoder = None
+_cross_encoder_lock = threading.Lock()
+_cross_encoder_loading = False
+
 def get_embeddings():
     """
-    Returns the embedding function using Hugging Face's Serverless Inference API.
+    Returns the embedding function using Hugging Face's Serverless Inference API
+    (local hashing embeddings in FAKE_DATA mode).
     """
+    if FAKE_DATA:
+        return HashingEmbeddings()
+
     api_key = os.getenv("HUGGINGFACEHUB_API_TOKEN")
     if not api_key:
         print("⚠️ WARNING: HUGGINGFACEHUB_API_TOKEN is missing. Embeddings will fail.")
@@ -82,8 +102,12 @@ def docs_from_news(news_docs: List[Dict]):
         
     return docs, ids
 
+@traced("ingest_documents")
 def ingest_documents(docs: List[Document], ids: List[str], collection_name: str):
-    """Smart Ingestion: Checks for existing IDs before adding."""
+    """
+    Smart Ingestion: Checks for existing IDs before adding.
+    Returns the number of new documents, or None if the ingestion failed.
+    """
     if not docs:
         return 0
 
@@ -105,6 +129,8 @@ def ingest_documents(docs: List[Document], ids: List[str], collection_name: str)
                 new_ids.append(doc_id)
                 
         if new_docs:
+            # The BM25 index is not updated here: ingestion runs in the Celery worker, which never
+            # serves retrieval; the API process catches up in sync_lexical_index
             vs.add_documents(documents=new_docs, ids=new_ids)
             print(f"✅ Ingested {len(new_docs)} new documents into '{collection_name}'.")
         else:
@@ -114,13 +140,148 @@ def ingest_documents(docs: List[Document], ids: List[str], collection_name: str)
         
     except Exception as e:
         print(f"❌ Critical Error in ingest_documents: {e}")
+        return None
+
+@traced("count_documents")
+def count_documents(collection="news"):
+    """Number of documents stored in a collection (0 if it is missing or unreachable)."""
+    try:
+        return get_vectorstore(collection)._collection.count()
+    except Exception as e:
+        print(f"❌ Error counting documents in '{collection}': {e}")
         return 0
 
-def retrieve(query, k=20, collection="news"):
+@traced("bm25_sync")
+def sync_lexical_index(vs, collection_name: str):
+    """
+    Brings the in-process BM25 index up to date with Chroma.
+    Ingestion usually runs in the Celery worker, so the API process picks up
+    new documents here. Only ids missing from the index are fetched.
+    """
+    index = get_lexical_index(collection_name)
+    try:
+        if vs._collection.count() == len(index):
+            return index
+
+        known = vs.get(include=[])["ids"]
+        missing = [doc_id for doc_id in known if doc_id not in index]
+        if missing:
+            records = vs.get(ids=missing, include=["documents", "metadatas"])
+            for doc_id, text, meta in zip(records["ids"], records["documents"], records["metadatas"]):
+                index.add(doc_id, text or "", meta)
+    except Exception as e:
+        print(f"⚠️ Could not sync lexical index for '{collection_name}': {e}")
+    return index
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = RRF_K):
+    """Fuses several ranked id lists. Returns [(id, score)] best first."""
+    scores = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)
+
+def get_cross_encoder():
+    """Loads the cross-encoder, downloading it on first use (blocking)."""
+    global _cross_encoder
+    with _cross_encoder_lock:
+        if _cross_encoder is None:
+            from sentence_transformers import CrossEncoder
+            _cross_encoder = CrossEncoder(RERANK_MODEL, device="cpu")
+    return _cross_encoder
+
+def _load_cross_encoder():
+    global _cross_encoder_loading
+    try:
+        get_cross_encoder()
+        print(f"✅ Reranker {RERANK_MODEL} loaded.")
+    except Exception as e:
+        print(f"⚠️ Reranker unavailable, using fused order: {e}")
+    finally:
+        _cross_encoder_loading = False
+
+def preload_cross_encoder():
+    """Starts loading the cross-encoder in a background thread (no-op if loaded or loading)."""
+    global _cross_encoder_loading
+    with _cross_encoder_lock:
+        if _cross_encoder is not None or _cross_encoder_loading:
+            return
+        _cross_encoder_loading = True
+    threading.Thread(target=_load_cross_encoder, name="cross-encoder-preload", daemon=True).start()
+
+@traced("rerank")
+def rerank(query: str, docs: List[Document], budget_ms: float = RERANK_BUDGET_MS):
+    """
+    Reorders docs with a CPU cross-encoder, scoring in small batches.
+    Once the latency budget is spent the remaining docs keep their fused order.
+    Until the model is loaded (see preload_cross_encoder) docs are returned as fused.
+    """
+    if not docs:
+        return docs
+
+    encoder = _cross_encoder
+    if encoder is None:
+        # Loading takes seconds (plus a download): never on the request path
+        preload_cross_encoder()
+        return docs
+
+    start = time.perf_counter()
+    scored = []
+    for i in range(0, len(docs), RERANK_BATCH_SIZE):
+        batch = docs[i:i + RERANK_BATCH_SIZE]
+        scores = encoder.predict([(query, d.page_content) for d in batch])
+        scored.extend(zip(batch, scores))
+        if (time.perf_counter() - start) * 1000 > budget_ms:
+            break
+
+    reranked = [d for d, _ in sorted(scored, key=lambda x: x[1], reverse=True)]
+    return reranked + docs[len(scored):]
+
+def _doc_key(doc: Document) -> str:
+    return getattr(doc, "id", None) or generate_doc_id(doc.metadata.get("url") or doc.page_content)
+
+def hybrid_rank(query: str, dense_docs: List[Document], index, k: int = 5, fetch_k: int = 20, use_rerank=None):
+    """
+    Fuses dense results with BM25 results over the same collection (RRF),
+    then optionally reranks the fused candidates.
+    """
+    docs_by_id = {_doc_key(d): d for d in dense_docs}
+    dense_ids = list(docs_by_id)
+    lexical_ids = [doc_id for doc_id, _ in index.search(query, fetch_k)]
+
+    candidates = []
+    for doc_id, _ in reciprocal_rank_fusion([dense_ids, lexical_ids])[:fetch_k]:
+        doc = docs_by_id.get(doc_id)
+        if doc is None:
+            text, meta = index.get(doc_id)
+            doc = Document(page_content=text, metadata=meta)
+        candidates.append(doc)
+
+    if RERANK_ENABLED if use_rerank is None else use_rerank:
+        candidates = rerank(query, candidates)
+
+    return candidates[:k]
+
+@traced("retrieve")
+def retrieve(query, k=20, collection="news", use_rerank=None):
+    """
+    Hybrid retrieval: Chroma similarity search + BM25, fused with RRF.
+    Pass the user's question as `query`, not the bare ticker.
+    """
+    fetch_k = max(k * 3, 20)
     try:
         vs = get_vectorstore(collection)
-        retriever = vs.as_retriever(search_kwargs={"k": k})
-        return retriever.invoke(query)
     except Exception as e:
         print(f"❌ Error retrieving documents: {e}")
-        return []
\ No newline at end of file
+        return []
+
+    index = sync_lexical_index(vs, collection)
+
+    try:
+        with span("chroma_search"):
+            dense_docs = vs.similarity_search(query, k=fetch_k)
+    except Exception as e:
+        print(f"⚠️ Dense search failed, falling back to BM25 only: {e}")
+        dense_docs = []
+
+    return hybrid_rank(query, dense_docs, index, k=k, fetch_k=fetch_k, use_rerank=use_rerank)
@@ -0,0 +1,178 @@
+"""
+Walk-forward backtesting for predict_prices.
+
+Each fold trains on a trailing window of bars (as production does with one
+year of history), forecasts `horizon` bars ahead and is scored against the
+realized close. Folds run in a process pool; every worker memory-maps the
+price arrays instead of receiving them pickled.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from .predictor import predict_prices
+
+# ~365 calendar days, the history fetch_price_history serves in production
+DEFAULT_WINDOW = 250
+
+# Named XGBoost overrides to compare accuracy against throughput
+MODEL_CONFIGS = {
+    "baseline": {},
+    "fewer_trees": {"n_estimators": 150},
+    "hist": {"tree_method": "hist"},
+    "hist_fewer_trees": {"tree_method": "hist", "n_estimators": 150, "max_depth": 4},
+}
+
+# ==========================================
+# 1. PRICE DATA (memory-mapped)
+# ==========================================
+
+def load_price_file(path: str):
+    """
+    Reads a price file: JSON as returned by fetch_price_history ([{date, close}])
+    or CSV with Date/Close columns (yfinance export). Returns (dates, closes).
+    """
+    if path.endswith(".json"):
+        df = pd.read_json(path)
+    else:
+        df = pd.read_csv(path)
+    df.columns = [c.lower() for c in df.columns]
+    df = df.dropna(subset=["close"]).sort_values("date")
+    dates = pd.to_datetime(df["date"], utc=True).dt.strftime("%Y-%m-%d").to_numpy(dtype="<U10")
+    return dates, df["close"].to_numpy(dtype=np.float64)
+
+def write_mmap(ticker: str, dates, closes, data_dir: str):
+    """Stores a ticker's arrays as .npy files that workers open with mmap_mode='r'."""
+    base = os.path.join(data_dir, ticker.upper())
+    np.save(f"{base}_dates.npy", np.asarray(dates, dtype="<U10"))
+    np.save(f"{base}_close.npy", np.ascontiguousarray(closes, dtype=np.float64))
+    return base
+
+_mmaps: Dict[str, tuple] = {}
+
+def _open_mmap(base: str):
+    if base not in _mmaps:
+        _mmaps[base] = (np.load(f"{base}_dates.npy", mmap_mode="r"), np.load(f"{base}_close.npy", mmap_mode="r"))
+    return _mmaps[base]
+
+# ==========================================
+# 2. FOLDS
+# ==========================================
+
+def walk_forward_origins(n_bars: int, window: int, horizon: int, n_folds: int) -> List[int]:
+    """
+    Forecast origins (index of the first unseen bar), evenly spaced so the
+    last fold ends on the final bar. Folds never overlap their own future.
+    """
+    first, last = window, n_bars - horizon
+    if last < first:
+        return []
+    if n_folds <= 1:
+        return [last]
+    step = max(1, (last - first) // (n_folds - 1))
+    return list(range(last, first - 1, -step))[:n_folds][::-1]
+
+def _run_fold(job):
+    """Runs one (ticker, origin) fold in a worker process."""
+    ticker, base, origin, window, horizon, config_name, params = job
+    dates, closes = _open_mmap(base)
+
+    history = [{"date": str(d), "close": float(c)} for d, c in zip(dates[origin - window:origin], closes[origin - window:origin])]
+
+    start = time.perf_counter()
+    # ticker keys the indicator cache; folds from different tickers share a worker
+    pred = asyncio.run(predict_prices(history, horizon, ticker=ticker, model_params=params))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if "error" in pred:
+        return None
+
+    current = float(closes[origin - 1])
+    actual = float(closes[origin + horizon - 1])
+    forecast = float(pred["forecast_7d"])
+    return {
+        "ticker": ticker,
+        "config": config_name,
+        "origin_date": str(dates[origin]),
+        "abs_error": abs(forecast - actual),
+        "pct_error": abs(forecast - actual) / actual,
+        "direction_hit": np.sign(forecast - current) == np.sign(actual - current),
+        "covered": pred["forecast_range_low"] <= actual <= pred["forecast_range_high"],
+        "elapsed_ms": elapsed_ms,
+    }
+
+def _warm_up(_):
+    """Forces worker start-up (imports) before any config is timed."""
+    return os.getpid()
+
+def summarize_folds(folds: List[Dict]) -> Dict:
+    if not folds:
+        return {"folds": 0}
+    return {
+        "folds": len(folds),
+        "mae": round(float(np.mean([f["abs_error"] for f in folds])), 4),
+        "mape_pct": round(float(np.mean([f["pct_error"] for f in folds])) * 100, 3),
+        "direction_accuracy": round(float(np.mean([f["direction_hit"] for f in folds])), 3),
+        "coverage_90": round(float(np.mean([f["covered"] for f in folds])), 3),
+        "fold_p50_ms": round(float(np.median([f["elapsed_ms"] for f in folds])), 2),
+    }
+
+# ==========================================
+# 3. RUNNER
+# ==========================================
+
+def run_backtest(
+    price_files: Dict[str, str],
+    configs: Optional[List[str]] = None,
+    horizon: int = 7,
+    n_folds: int = 20,
+    window: int = DEFAULT_WINDOW,
+    workers: Optional[int] = None,
+):
+    """
+    Backtests each model config over all tickers' walk-forward folds.
+    Returns one summary per config (accuracy + throughput), all tickers pooled.
+    """
+    configs = configs or list(MODEL_CONFIGS)
+    workers = workers or os.cpu_count() or 1
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="backtest_") as data_dir:
+        bases = {}
+        for ticker, path in price_files.items():
+            dates, closes = load_price_file(path)
+            bases[ticker] = (write_mmap(ticker, dates, closes, data_dir), len(closes))
+
+        # spawn: XGBoost's OpenMP runtime is not fork-safe
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            list(pool.map(_warm_up, range(workers)))
+
+            for config_name in configs:
+                # One tree-building thread per process; parallelism comes from the pool
+                params = {**MODEL_CONFIGS[config_name], "n_jobs": 1}
+                jobs = [
+                    (ticker, base, origin, window, horizon, config_name, params)
+                    for ticker, (base, n_bars) in bases.items()
+                    for origin in walk_forward_origins(n_bars, window, horizon, n_folds)
+                ]
+
+                start = time.perf_counter()
+                folds = [f for f in pool.map(_run_fold, jobs) if f]
+                wall = time.perf_counter() - start
+
+                results.append({
+                    "name": config_name,
+                    "model_params": MODEL_CONFIGS[config_name],
+                    "tickers": len(bases),
+                    "horizon": horizon,
+                    **summarize_folds(folds),
+                    "folds_per_sec": round(len(folds) / wall, 3) if wall else None,
+                })
+    return results
@@ -1,6 +1,7 @@
 import redis
 import json
 import os
+from .metrics import record_cache_lookup
 
 # Connect to the Redis container
 # We use host="redis" because that's the service name in docker-compose
@@ -17,8 +18,16 @@ except redis.ConnectionError:
 def get_cache(key: str):
     if not cache: return None
     data = cache.get(key)
+    record_cache_lookup(key, data is not None)
     return json.loads(data) if data else None
 
 def set_cache(key: str, data: dict, expire: int = 300):
     if not cache: return
-    cache.set(key, json.dumps(data), ex=expire)
\ No newline at end of file
+    cache.set(key, json.dumps(data), ex=expire)
+
+def get_ttl(key: str):
+    """Seconds until `key` expires: None if it is missing (or Redis is not connected), inf if it never expires."""
+    if not cache: return None
+    ttl = cache.ttl(key)
+    if ttl == -2: return None
+    return float("inf") if ttl == -1 else ttl
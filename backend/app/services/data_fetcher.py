@@ -1,14 +1,23 @@
 import os
+import asyncio
 from datetime import datetime, timedelta
 import yfinance as yf
 from newsapi import NewsApiClient
 from dotenv import load_dotenv
 from .cache import get_cache, set_cache
+from .metrics import traced
+from .rate_limit import note_upstream_call
+from .fixtures import FAKE_DATA, fake_fundamentals, fake_price_history, fake_news_docs
 
 load_dotenv()
 
 NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")
 
+# Cache lifetimes. Hot tickers are re-fetched before expiry by the refresher (see refresher.py)
+FUNDAMENTALS_TTL = int(os.getenv("FUNDAMENTALS_TTL_SECONDS", "600"))
+PRICE_TTL = int(os.getenv("PRICE_TTL_SECONDS", "3600"))
+NEWS_TTL = int(os.getenv("NEWS_TTL_SECONDS", "3600"))
+
 if NEWSAPI_KEY:
     newsapi = NewsApiClient(api_key=NEWSAPI_KEY)
 else:
@@ -61,22 +70,42 @@ def get_financial_trends(stock):
         return {"error": f"Trend calc failed: {str(e)}"}
 
 
-async def fetch_fundamentals(ticker: str):
+def fundamentals_key(ticker: str):
+    return f"fundamentals_{ticker.upper()}"
+
+def price_history_key(ticker: str, days: int = 365):
+    return f"price_history_{ticker.upper()}_{days}"
+
+def news_key(ticker: str, limit: int = 25):
+    return f"news_{ticker.upper()}_{limit}"
+
+
+@traced("fetch_fundamentals")
+async def fetch_fundamentals(ticker: str, refresh: bool = False):
     """
     Fetches company fundamentals using yfinance.
+    `refresh` skips the cache read (the result is still cached).
     """
     
-    cache_key = f"fundamentals_{ticker.upper()}"
-    cache_data = get_cache(cache_key)  
+    cache_key = fundamentals_key(ticker)
+    cache_data = None if refresh else get_cache(cache_key)
     if cache_data:
         return cache_data
+
+    if FAKE_DATA:
+        result = fake_fundamentals(ticker)
+        set_cache(cache_key, result, expire=FUNDAMENTALS_TTL)
+        return result
     
+    # .info and .quarterly_financials are two Yahoo requests
+    note_upstream_call("yfinance", 2)
     stock = yf.Ticker(ticker)
-    info = stock.info
+    # yfinance and NewsAPI are blocking: run them in threads so gathered fetches overlap
+    info = await asyncio.to_thread(lambda: stock.info)
     if not info or "regularMarketPrice" not in info:
         return {"error": "Invalid ticker or no data available."}
     
-    trends = get_financial_trends(stock)
+    trends = await asyncio.to_thread(get_financial_trends, stock)
 
     result ={
         "symbol": ticker.upper(),
@@ -89,19 +118,28 @@ async def fetch_fundamentals(ticker: str):
         "industry": info.get("industry"),
         "financial_trends": trends
     }
-    set_cache(cache_key, result, expire=600)
+    set_cache(cache_key, result, expire=FUNDAMENTALS_TTL)
     return result
 
-async def fetch_price_history(ticker: str, days: int = 365):
+@traced("fetch_price_history")
+async def fetch_price_history(ticker: str, days: int = 365, refresh: bool = False):
     """
     Fetches historical daily close prices.
+    `refresh` skips the cache read (the result is still cached).
     """
-    cache_key = f"price_history_{ticker.upper()}_{days}"
-    cache_data = get_cache(cache_key)
+    cache_key = price_history_key(ticker, days)
+    cache_data = None if refresh else get_cache(cache_key)
     if cache_data:
         return cache_data
+
+    if FAKE_DATA:
+        prices = fake_price_history(ticker, days)
+        set_cache(cache_key, prices, expire=PRICE_TTL)
+        return prices
+
+    note_upstream_call("yfinance")
     stock = yf.Ticker(ticker)
-    data = stock.history(period=f"{days}d")
+    data = await asyncio.to_thread(stock.history, period=f"{days}d")
 
     if data.empty:
         return []
@@ -110,27 +148,35 @@ async def fetch_price_history(ticker: str, days: int = 365):
     for index, row in data.iterrows():
         prices.append({"date": str(index.date()), "close": round(float(row["Close"]), 2)})
         
-    set_cache(cache_key, prices, expire=3600)
+    set_cache(cache_key, prices, expire=PRICE_TTL)
     
     return prices
 
 
-async def fetch_news_docs(ticker: str, limit: int = 25):
+@traced("fetch_news_docs")
+async def fetch_news_docs(ticker: str, limit: int = 25, refresh: bool = False):
+    cache_key = news_key(ticker, limit)
+    cache_data = None if refresh else get_cache(cache_key)
+    if cache_data:
+        return cache_data
+
+    if FAKE_DATA:
+        result = fake_news_docs(ticker, limit)
+        set_cache(cache_key, result, expire=NEWS_TTL)
+        return result
+
     if newsapi is None:
         return [{"error": "NEWSAPI_KEY not set"}]
     
     to_date = datetime.utcnow()
     from_date = to_date - timedelta(days=14)
-    
-    cache_key = f"news_{ticker.upper()}_{limit}"
-    cache_data = get_cache(cache_key)
-    if cache_data:
-        return cache_data
 
     # Query both ticker & company name keywords
     query = f"{ticker} stocks"
 
-    articles = newsapi.get_everything(
+    note_upstream_call("newsapi")
+    articles = await asyncio.to_thread(
+        newsapi.get_everything,
         q=query,
         language="en",
         page_size=limit,
@@ -148,5 +194,5 @@ async def fetch_news_docs(ticker: str, limit: int = 25):
             "content": article["description"]
         })
         
-    set_cache(cache_key, result, expire=3600)
+    set_cache(cache_key, result, expire=NEWS_TTL)
     return result
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""
+Deterministic offline fixtures, enabled with FAKE_DATA=1.
+Replaces yfinance, NewsAPI, Hugging Face embeddings and Gemini so the app and
+the benchmarks run without network access or API keys. FinBERT still runs
+for real (from the local HF cache), since it is part of what we measure.
+"""
+
+import hashlib
+import json
+import math
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from langchain_core.embeddings import Embeddings
+
+FAKE_DATA = os.getenv("FAKE_DATA", "0") == "1"
+# Simulated Gemini latency, so load tests see a realistic LLM share
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "0"))
+
+# Fixed "today" so every run sees the same dates
+FIXTURE_END_DATE = datetime(2024, 6, 28)
+
+NEWS_TEMPLATES = [
+    ("{t} beats quarterly revenue estimates on strong services growth", "Revenue rose 8% year over year as margins expanded."),
+    ("{t} shares slide after guidance cut", "Management lowered full-year guidance citing weaker demand in China."),
+    ("Analysts upgrade {t} to buy on AI tailwinds", "The brokerage raised its price target, pointing to accelerating AI adoption."),
+    ("{t} faces antitrust probe in the EU", "Regulators opened an investigation into the company's app store practices."),
+    ("{t} announces $50B share buyback", "The board authorized a new repurchase program and raised the dividend."),
+    ("Tariff fears weigh on {t} supply chain", "New import duties could raise production costs for key components."),
+    ("{t} volatility rises ahead of Fed decision", "Options traders hedged against a hawkish interest rate surprise."),
+    ("{t} CEO sells shares under trading plan", "The sale was pre-arranged and routine according to filings."),
+    ("{t} expands manufacturing in India", "The company continues to diversify production away from China."),
+    ("{t} misses earnings as costs climb", "Operating expenses grew faster than revenue, pressuring net income."),
+]
+
+
+def _rng(*parts):
+    seed = int(hashlib.md5("|".join(map(str, parts)).encode("utf-8")).hexdigest()[:8], 16)
+    return random.Random(seed)
+
+
+def fake_fundamentals(ticker: str):
+    rng = _rng("fundamentals", ticker)
+    revenues = [rng.uniform(20e9, 120e9) for _ in range(4)]
+    margins = [round(rng.uniform(5, 30), 2) for _ in range(4)]
+    growth = (revenues[0] - revenues[1]) / revenues[1] * 100
+    return {
+        "symbol": ticker.upper(),
+        "name": f"{ticker.upper()} Fixture Corp",
+        "market_cap": int(rng.uniform(50e9, 3e12)),
+        "pe_ratio": round(rng.uniform(10, 45), 2),
+        "eps": round(rng.uniform(1, 12), 2),
+        "de_ratio": round(rng.uniform(10, 200), 2),
+        "sector": "Technology",
+        "industry": "Consumer Electronics",
+        "financial_trends": {
+            "recent_quarterly_revenue": [f"${x/1e9:.2f}B" for x in revenues],
+            "recent_profit_margins": [f"{m}%" for m in margins],
+            "revenue_growth_last_q": f"{growth:+.2f}%",
+            "trend_direction": "Growing" if growth > 0 else "Declining",
+        },
+    }
+
+
+def fake_price_history(ticker: str, days: int = 365):
+    """Seeded geometric random walk over business days."""
+    rng = _rng("prices", ticker)
+    price = rng.uniform(50, 500)
+    drift, vol = rng.uniform(-0.0005, 0.001), rng.uniform(0.01, 0.025)
+
+    dates = []
+    current = FIXTURE_END_DATE - timedelta(days=days)
+    while current <= FIXTURE_END_DATE:
+        if current.weekday() < 5:
+            dates.append(current)
+        current += timedelta(days=1)
+
+    prices = []
+    for d in dates:
+        price *= math.exp(rng.gauss(drift, vol))
+        prices.append({"date": d.strftime("%Y-%m-%d"), "close": round(price, 2)})
+    return prices
+
+
+def fake_news_docs(ticker: str, limit: int = 25):
+    rng = _rng("news", ticker)
+    result = []
+    for i in range(limit):
+        title, content = NEWS_TEMPLATES[(i + rng.randrange(len(NEWS_TEMPLATES))) % len(NEWS_TEMPLATES)]
+        published = FIXTURE_END_DATE - timedelta(hours=6 * i)
+        result.append({
+            "title": title.format(t=ticker.upper()),
+            "source": "Fixture Wire",
+            "url": f"https://fixtures.local/{ticker.lower()}/{i:03d}",
+            "published_at": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "content": content,
+        })
+    return result
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Local, deterministic bag-of-words embeddings (feature hashing).
+    Implements the LangChain Embeddings interface used by Chroma.
+    """
+
+    def __init__(self, size: int = 256):
+        self.size = size
+
+    def _embed(self, text: str):
+        from ..rag.lexical_index import tokenize
+
+        vec = [0.0] * self.size
+        for token in tokenize(text):
+            h = int(hashlib.md5(token.encode("utf-8")).hexdigest()[:8], 16)
+            vec[h % self.size] += 1.0 if (h >> 31) & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+class StubLLMResponse:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class StubLLM:
+    """Stands in for ChatGoogleGenerativeAI: returns the JSON shape run_chat expects."""
+
+    def invoke(self, prompt: str):
+        if FAKE_LLM_LATENCY_MS:
+            time.sleep(FAKE_LLM_LATENCY_MS / 1000)
+        digest = hashlib.md5(prompt.encode("utf-8")).hexdigest()[:8]
+        return StubLLMResponse(json.dumps({
+            "analysis": f"Fixture analysis ({digest}).",
+            "sentiment_summary": "Neutral fixture sentiment.",
+            "prediction_summary": "Fixture forecast within the 90% confidence band.",
+            "risk_factors": "Fixture risk A, fixture risk B",
+            "confidence": "Medium",
+            "disclaimer": "Not financial advice. For informational purposes only.",
+        }))
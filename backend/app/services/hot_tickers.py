@@ -0,0 +1,82 @@
+import os
+import time
+import threading
+from .cache import cache
+
+# A request's weight halves after this long, so scores track recent demand
+HOT_HALF_LIFE = float(os.getenv("HOT_TICKER_HALF_LIFE_SECONDS", "3600"))
+
+HOT_TICKERS_KEY = "hot_tickers"
+HOT_EPOCH_KEY = "hot_tickers_epoch"
+
+# Weights grow as 2 ** (half-lives since epoch); rebase long before float overflow (2 ** 1024)
+_REBASE_AFTER = 256
+# Tickers whose decayed score falls below this are dropped on rebase
+_MIN_SCORE = 0.01
+
+# Decay without rewriting the set: each hit adds 2 ** ((now - epoch) / half_life),
+# so older hits weigh exponentially less relative to new ones. The epoch rebase
+# runs in the same script so no increment ever mixes two epochs.
+_RECORD_SCRIPT = """
+local now = tonumber(ARGV[2])
+local half_life = tonumber(ARGV[3])
+local epoch = tonumber(redis.call('GET', KEYS[2]))
+if not epoch then
+    epoch = now
+    redis.call('SET', KEYS[2], tostring(now))
+end
+local half_lives = (now - epoch) / half_life
+if half_lives > tonumber(ARGV[4]) then
+    redis.call('ZUNIONSTORE', KEYS[1], 1, KEYS[1], 'WEIGHTS', tostring(2 ^ -half_lives))
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[5])
+    redis.call('SET', KEYS[2], tostring(now))
+    half_lives = 0
+end
+return redis.call('ZINCRBY', KEYS[1], tostring(2 ^ half_lives), ARGV[1])
+"""
+_record = cache.register_script(_RECORD_SCRIPT) if cache else None
+
+# Per-process fallback when Redis is not connected
+_local_scores = {}
+_local_epoch = None
+_local_lock = threading.Lock()
+
+
+def record_request(ticker: str):
+    """Counts one user request for a ticker."""
+    ticker = ticker.upper()
+    now = time.time()
+    if _record:
+        _record(keys=[HOT_TICKERS_KEY, HOT_EPOCH_KEY], args=[ticker, now, HOT_HALF_LIFE, _REBASE_AFTER, _MIN_SCORE])
+        return
+
+    global _local_epoch
+    with _local_lock:
+        if _local_epoch is None:
+            _local_epoch = now
+        half_lives = (now - _local_epoch) / HOT_HALF_LIFE
+        if half_lives > _REBASE_AFTER:
+            for t in list(_local_scores):
+                _local_scores[t] *= 2 ** -half_lives
+                if _local_scores[t] < _MIN_SCORE:
+                    del _local_scores[t]
+            _local_epoch, half_lives = now, 0
+        _local_scores[ticker] = _local_scores.get(ticker, 0.0) + 2 ** half_lives
+
+def top_tickers(n: int):
+    """
+    The `n` most requested tickers as [(ticker, score)], hottest first.
+    The score is the decayed request count: hits in the last half-life count ~1, older ones less.
+    """
+    now = time.time()
+    if cache:
+        entries = cache.zrevrange(HOT_TICKERS_KEY, 0, n - 1, withscores=True)
+        epoch = cache.get(HOT_EPOCH_KEY)
+        epoch = float(epoch) if epoch else now
+    else:
+        with _local_lock:
+            entries = sorted(_local_scores.items(), key=lambda e: e[1], reverse=True)[:n]
+            epoch = _local_epoch or now
+
+    scale = 2 ** -((now - epoch) / HOT_HALF_LIFE)
+    return [(ticker, score * scale) for ticker, score in entries]
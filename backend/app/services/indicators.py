@@ -0,0 +1,199 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional: the recursive kernels below run as plain Python loops
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+# ==========================================
+# 1. CONFIGURATION
+# ==========================================
+
+ALL_INDICATORS = (
+    "log_ret", "volatility", "rsi", "rsi_wilder", "sma_dist",
+    "ema_fast", "ema_slow", "macd", "macd_signal", "macd_hist", "atr", "bb_width",
+)
+
+# What the forecaster, chart and prompt need
+DEFAULT_INDICATORS = ALL_INDICATORS
+
+VOLATILITY_WINDOW = 5
+RSI_WINDOW = 14
+SMA_WINDOW = 10
+EMA_FAST, EMA_SLOW, MACD_SIGNAL = 12, 26, 9
+ATR_WINDOW = 14
+BB_WINDOW, BB_STD = 20, 2.0
+
+INDICATOR_CACHE_SIZE = 256
+
+# ==========================================
+# 2. KERNELS
+# ==========================================
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean; NaN until the window is full (pandas rolling semantics)."""
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        out[window - 1:] = sliding_window_view(x, window).mean(axis=1)
+    return out
+
+def _rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sample std (ddof=1); NaN until the window is full."""
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        out[window - 1:] = sliding_window_view(x, window).std(axis=1, ddof=1)
+    return out
+
+@njit(cache=True)
+def _ema(x, span):
+    """EMA with alpha = 2 / (span + 1), seeded with the first value (pandas adjust=False)."""
+    alpha = 2.0 / (span + 1.0)
+    out = np.empty(len(x))
+    if len(x) == 0:
+        return out
+    out[0] = x[0]
+    for i in range(1, len(x)):
+        out[i] = alpha * x[i] + (1.0 - alpha) * out[i - 1]
+    return out
+
+@njit(cache=True)
+def _wilder(x, window):
+    """Wilder smoothing: SMA seed over the first window, then alpha = 1 / window."""
+    out = np.full(len(x), np.nan)
+    if len(x) < window:
+        return out
+    acc = 0.0
+    for i in range(window):
+        acc += x[i]
+    out[window - 1] = acc / window
+    for i in range(window, len(x)):
+        out[i] = out[i - 1] + (x[i] - out[i - 1]) / window
+    return out
+
+def _rsi(gain: np.ndarray, loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+# ==========================================
+# 3. ENGINE
+# ==========================================
+
+def compute_indicators(close, indicators=DEFAULT_INDICATORS, high=None, low=None) -> Dict[str, np.ndarray]:
+    """
+    Computes the requested indicators over contiguous float64 arrays in one pass.
+    NaN warm-up values are filled with 0, matching the original pandas pipeline.
+
+    ATR uses the true range when high/low are given; with close-only history
+    it falls back to the close-to-close range |close[t] - close[t-1]|.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    n = len(close)
+    wanted = set(indicators)
+    out = {"close": close}
+
+    prev_close = np.empty(n)
+    prev_close[:1] = np.nan
+    prev_close[1:] = close[:-1]
+    delta = close - prev_close
+    # pandas: delta.where(delta > 0, 0) turns the leading NaN into 0
+    delta_clean = np.nan_to_num(delta, nan=0.0)
+    gain = np.where(delta_clean > 0, delta_clean, 0.0)
+    loss = np.where(delta_clean < 0, -delta_clean, 0.0)
+
+    log_ret = np.log(close / prev_close)
+    if "log_ret" in wanted:
+        out["log_ret"] = log_ret
+    if "volatility" in wanted:
+        out["volatility"] = _rolling_std(log_ret, VOLATILITY_WINDOW)
+    if "rsi" in wanted:
+        out["rsi"] = _rsi(_rolling_mean(gain, RSI_WINDOW), _rolling_mean(loss, RSI_WINDOW))
+    if "rsi_wilder" in wanted:
+        # Wilder's RSI seeds from the first real change, not the padded one
+        rsi = np.full(n, np.nan)
+        rsi[1:] = _rsi(_wilder(gain[1:], RSI_WINDOW), _wilder(loss[1:], RSI_WINDOW))
+        out["rsi_wilder"] = rsi
+    if "sma_dist" in wanted:
+        out["sma_dist"] = close / _rolling_mean(close, SMA_WINDOW) - 1
+
+    if wanted & {"ema_fast", "ema_slow", "macd", "macd_signal", "macd_hist"}:
+        ema_fast, ema_slow = _ema(close, EMA_FAST), _ema(close, EMA_SLOW)
+        macd = ema_fast - ema_slow
+        macd_signal = _ema(macd, MACD_SIGNAL)
+        for name, values in (("ema_fast", ema_fast), ("ema_slow", ema_slow), ("macd", macd),
+                             ("macd_signal", macd_signal), ("macd_hist", macd - macd_signal)):
+            if name in wanted:
+                out[name] = values
+
+    if "atr" in wanted:
+        if high is not None and low is not None:
+            high = np.ascontiguousarray(high, dtype=np.float64)
+            low = np.ascontiguousarray(low, dtype=np.float64)
+            true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        else:
+            true_range = np.abs(delta)
+        atr = np.full(n, np.nan)
+        atr[1:] = _wilder(true_range[1:], ATR_WINDOW)
+        out["atr"] = atr
+
+    if "bb_width" in wanted:
+        # (upper - lower) / middle for Bollinger bands at BB_STD deviations
+        mid = _rolling_mean(close, BB_WINDOW)
+        out["bb_width"] = 2 * BB_STD * _rolling_std(close, BB_WINDOW) / mid
+
+    for name, values in out.items():
+        if name != "close":
+            out[name] = np.nan_to_num(values, nan=0.0, posinf=0.0, neginf=0.0)
+    return out
+
+# ==========================================
+# 4. SHARED CACHE (per ticker + last bar)
+# ==========================================
+
+_cache: "OrderedDict[tuple, Dict[str, np.ndarray]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _cache_key(price_history: List[Dict], ticker: Optional[str], indicators):
+    first, last = price_history[0], price_history[-1]
+    return (ticker.upper() if ticker else None, len(price_history), first["date"], last["date"], last["close"], tuple(indicators))
+
+def get_indicators(price_history: List[Dict], ticker: Optional[str] = None, indicators=DEFAULT_INDICATORS) -> Dict[str, np.ndarray]:
+    """
+    Indicators for a price history, cached per (ticker, last bar) so the chart,
+    the forecaster and the prompt share one computation. Treat arrays as read-only.
+    """
+    if not price_history:
+        return {}
+
+    key = _cache_key(price_history, ticker, indicators)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    close = np.fromiter((p["close"] for p in price_history), dtype=np.float64, count=len(price_history))
+    has_range = "high" in price_history[-1] and "low" in price_history[-1]
+    high = np.fromiter((p["high"] for p in price_history), dtype=np.float64) if has_range else None
+    low = np.fromiter((p["low"] for p in price_history), dtype=np.float64) if has_range else None
+
+    result = compute_indicators(close, indicators, high=high, low=low)
+    for values in result.values():
+        values.flags.writeable = False
+
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > INDICATOR_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+def latest_indicators(indicators: Dict[str, np.ndarray]) -> Dict[str, float]:
+    """Most recent value of each indicator, rounded for prompts and API responses."""
+    return {name: round(float(values[-1]), 4) for name, values in indicators.items() if name != "close" and len(values)}
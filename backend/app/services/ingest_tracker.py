@@ -0,0 +1,89 @@
+import os
+import time
+import threading
+from .cache import cache
+
+# News older than this is refreshed on the next chat for the ticker
+INGEST_TTL = int(os.getenv("INGEST_TTL_SECONDS", "1800"))
+# Upper bound on how long an in-flight marker can outlive a crashed worker
+INGEST_LOCK_TTL = int(os.getenv("INGEST_LOCK_TTL_SECONDS", "120"))
+
+# Deletes the in-flight marker only if it still holds the caller's task id
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+_release = cache.register_script(_RELEASE_SCRIPT) if cache else None
+
+# Per-process fallback when Redis is not connected
+_local_last = {}
+_local_inflight = {}
+_local_lock = threading.Lock()
+
+
+def _last_key(ticker: str):
+    return f"ingest_last_{ticker.upper()}"
+
+def _inflight_key(ticker: str):
+    return f"ingest_inflight_{ticker.upper()}"
+
+
+def get_last_ingested(ticker: str):
+    """Returns the unix timestamp of the last successful ingestion, or None."""
+    if cache:
+        value = cache.get(_last_key(ticker))
+        return float(value) if value else None
+    return _local_last.get(ticker.upper())
+
+def mark_ingested(ticker: str, timestamp: float = None):
+    timestamp = timestamp or time.time()
+    if cache:
+        cache.set(_last_key(ticker), timestamp)
+    else:
+        _local_last[ticker.upper()] = timestamp
+
+def is_stale(ticker: str, ttl: int = INGEST_TTL):
+    last = get_last_ingested(ticker)
+    return last is None or time.time() - last > ttl
+
+
+def get_inflight(ticker: str):
+    """Returns the task id of the in-flight ingestion for a ticker, if any."""
+    if cache:
+        return cache.get(_inflight_key(ticker))
+
+    with _local_lock:
+        entry = _local_inflight.get(ticker.upper())
+        if entry and entry[1] > time.time():
+            return entry[0]
+        return None
+
+def claim_ingest(ticker: str, task_id: str, ttl: int = INGEST_LOCK_TTL):
+    """
+    Atomically marks an ingestion as in flight.
+    Returns True if the claim was taken, False if another one is running.
+    """
+    if cache:
+        return bool(cache.set(_inflight_key(ticker), task_id, nx=True, ex=ttl))
+
+    with _local_lock:
+        entry = _local_inflight.get(ticker.upper())
+        if entry and entry[1] > time.time():
+            return False
+        _local_inflight[ticker.upper()] = (task_id, time.time() + ttl)
+        return True
+
+def release_ingest(ticker: str, task_id: str):
+    """
+    Clears the in-flight marker if `task_id` still owns it. After INGEST_LOCK_TTL
+    another ingestion may have claimed the ticker; its marker is left alone.
+    """
+    if _release:
+        _release(keys=[_inflight_key(ticker)], args=[task_id])
+    else:
+        with _local_lock:
+            entry = _local_inflight.get(ticker.upper())
+            if entry and entry[0] == task_id:
+                del _local_inflight[ticker.upper()]
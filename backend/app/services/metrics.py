@@ -0,0 +1,135 @@
+import asyncio
+import functools
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from prometheus_client import Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily
+
+# ==========================================
+# 1. PROMETHEUS METRICS
+# ==========================================
+
+STAGE_LATENCY = Histogram(
+    "pipeline_stage_latency_seconds",
+    "Latency of each pipeline stage (Chroma, yfinance, NewsAPI, FinBERT, XGBoost, Gemini...)",
+    ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+STAGE_ERRORS = Counter("pipeline_stage_errors_total", "Exceptions raised per pipeline stage", ["stage"])
+
+HTTP_LATENCY = Histogram(
+    "http_request_latency_seconds",
+    "End-to-end HTTP request latency",
+    ["method", "path", "status"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+CACHE_REQUESTS = Counter("cache_requests_total", "Redis cache lookups", ["cache", "result"])
+
+QUEUE_DEPTH = Gauge("celery_queue_depth", "Messages waiting in each Celery queue", ["queue"])
+
+# Hot-ticker refresher (see refresher.py). Refreshes run in a Celery worker, which
+# records them in Redis; the API exports them on /metrics.
+REFRESH_LAG_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600)
+
+class RefresherCollector:
+    """
+    Exports the refresher's Redis-backed totals: cache_refreshes_total{source, result}
+    and the cache_refresh_lag_seconds{source} histogram. `totals` is loaded by /metrics
+    (refresher.refresher_status), so collecting never touches Redis.
+    """
+
+    def __init__(self):
+        self.totals = None
+
+    def collect(self):
+        if not self.totals:
+            return
+
+        refreshes = CounterMetricFamily("cache_refreshes", "Hot-ticker cache refreshes", labels=["source", "result"])
+        for (source, result), count in sorted(self.totals["refreshes"].items()):
+            refreshes.add_metric([source, result], count)
+        yield refreshes
+
+        lag = HistogramMetricFamily(
+            "cache_refresh_lag_seconds",
+            "How long after its refresh window opened a hot ticker's cache entry was re-fetched",
+            labels=["source"],
+        )
+        for source, hist in sorted(self.totals["lag"].items()):
+            buckets = [(str(float(le)), hist["buckets"].get(le, 0)) for le in REFRESH_LAG_BUCKETS]
+            lag.add_metric([source], buckets + [("+Inf", hist["count"])], hist["sum"])
+        yield lag
+
+REFRESHER_TOTALS = RefresherCollector()
+REGISTRY.register(REFRESHER_TOTALS)
+
+REFRESHER_LAST_CYCLE = Gauge("cache_refresher_last_cycle", "Summary of the last refresh cycle", ["field"])
+HOT_CACHE_COLD = Gauge("hot_ticker_cold_entries", "Hot-ticker cache entries missing right now", ["source"])
+HOT_CACHE_MIN_TTL = Gauge("hot_ticker_min_ttl_seconds", "Lowest remaining TTL among hot-ticker cache entries", ["source"])
+
+# Cache keys look like "price_history_AAPL_365": the lowercase prefix names the cache
+CACHE_NAME_RE = re.compile(r"^([a-z_]+?)_[A-Z0-9]")
+
+def record_cache_lookup(key: str, hit: bool):
+    match = CACHE_NAME_RE.match(key)
+    CACHE_REQUESTS.labels(match.group(1) if match else key, "hit" if hit else "miss").inc()
+
+def metrics_payload():
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+# ==========================================
+# 2. PER-REQUEST TIMING BREAKDOWN
+# ==========================================
+
+# Shared (mutable) dict so spans in gathered tasks and worker threads land in the same request
+_timings: ContextVar = ContextVar("request_timings", default=None)
+
+def start_timing():
+    """Starts collecting a timing breakdown for the current request."""
+    _timings.set({"started": time.perf_counter(), "stages": {}})
+
+def timing_breakdown():
+    """Returns {"total_ms", "stages": {stage: ms}} for the current request."""
+    timings = _timings.get()
+    if timings is None:
+        return {}
+    return {
+        "total_ms": round((time.perf_counter() - timings["started"]) * 1000, 2),
+        "stages": {k: round(v, 2) for k, v in timings["stages"].items()},
+    }
+
+@contextmanager
+def span(stage: str):
+    """Times a block: observed in Prometheus and added to the request breakdown."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(stage).inc()
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_LATENCY.labels(stage).observe(elapsed)
+        timings = _timings.get()
+        if timings is not None:
+            timings["stages"][stage] = timings["stages"].get(stage, 0.0) + elapsed * 1000
+
+def traced(stage: str):
+    """Decorator version of `span` for sync and async functions."""
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,108 @@
+import numpy as np
+from typing import Dict, List
+
+# Keeps one request's fan-out (fetches, FinBERT batch, forecasts) bounded
+MAX_PORTFOLIO_TICKERS = 10
+TRADING_DAYS = 252
+
+
+def normalize_weights(holdings: List[Dict]) -> Dict[str, float]:
+    """
+    Merges duplicate tickers and rescales weights to sum to 1.
+    Missing weights default to an equal split.
+    """
+    raw = {}
+    for h in holdings:
+        ticker = h["ticker"].strip().upper()
+        weight = h.get("weight")
+        raw[ticker] = raw.get(ticker, 0.0) + (1.0 if weight is None else float(weight))
+
+    total = sum(raw.values())
+    if total <= 0:
+        raise ValueError("Portfolio weights must sum to a positive number.")
+    return {t: w / total for t, w in raw.items()}
+
+
+def aligned_log_returns(price_histories: Dict[str, List[Dict]]):
+    """
+    Daily log returns over the dates every ticker has a close for.
+    Returns (tickers, matrix[n_days - 1, n_tickers]).
+    """
+    tickers = [t for t, ph in price_histories.items() if ph]
+    if not tickers:
+        return [], np.empty((0, 0))
+
+    common = set.intersection(*(set(p["date"] for p in price_histories[t]) for t in tickers))
+    dates = sorted(common)
+    if len(dates) < 2:
+        return tickers, np.empty((0, len(tickers)))
+
+    closes = np.empty((len(dates), len(tickers)))
+    for j, t in enumerate(tickers):
+        by_date = {p["date"]: p["close"] for p in price_histories[t]}
+        closes[:, j] = [by_date[d] for d in dates]
+    return tickers, np.diff(np.log(closes), axis=0)
+
+
+def portfolio_aggregates(weights: Dict[str, float], price_histories, predictions, sentiments) -> Dict:
+    """
+    Portfolio-level view: forecast return and 90% band, weighted sentiment,
+    correlation matrix and annualized volatility from the price arrays.
+    Forecast and volatility figures are over the holdings that have a forecast
+    (resp. prices), reweighted to sum to 1; their share is reported as coverage.
+    """
+    # Per holding: forecast return and half-width of its 90% band, both relative to the current price
+    forecasts = {}
+    for t in weights:
+        pred = predictions.get(t) or {}
+        if "forecast_7d" not in pred:
+            continue
+        current = float(pred["current_price"])
+        forecasts[t] = (
+            pred["forecast_7d"] / current - 1,
+            (pred["forecast_range_high"] - pred["forecast_range_low"]) / (2 * current),
+        )
+    forecast_weight = sum(weights[t] for t in forecasts)
+
+    weighted_sentiment = sum(w * (sentiments.get(t) or {}).get("average_sentiment", 0) for t, w in weights.items())
+
+    tickers, returns = aligned_log_returns(price_histories)
+    correlation, volatility, corr = None, None, None
+    price_weight = sum(weights[t] for t in tickers)
+    if len(returns) > 1 and price_weight > 0:
+        w = np.array([weights[t] for t in tickers]) / price_weight
+        cov = np.atleast_2d(np.cov(returns, rowvar=False))
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.nan_to_num(cov / np.outer(std, std))
+        np.fill_diagonal(corr, 1.0)
+        correlation = {"tickers": tickers, "matrix": np.round(corr, 3).tolist()}
+        volatility = float(np.sqrt(w @ cov @ w * TRADING_DAYS))
+
+    expected_return, expected_range = None, None
+    if forecast_weight > 0:
+        fw = np.array([weights[t] for t in forecasts]) / forecast_weight
+        ret = np.array([r for r, _ in forecasts.values()])
+        half = np.array([h for _, h in forecasts.values()])
+        # Combine the per-holding bands through the return correlations; pairs without
+        # aligned prices are assumed perfectly correlated (the conservative case)
+        rho = np.ones((len(forecasts), len(forecasts)))
+        if corr is not None:
+            idx = {t: i for i, t in enumerate(tickers)}
+            for a, ta in enumerate(forecasts):
+                for b, tb in enumerate(forecasts):
+                    if ta in idx and tb in idx:
+                        rho[a, b] = corr[idx[ta], idx[tb]]
+        expected_return = float(fw @ ret)
+        band = float(np.sqrt(max((fw * half) @ rho @ (fw * half), 0.0)))
+        expected_range = [round((expected_return - band) * 100, 3), round((expected_return + band) * 100, 3)]
+
+    return {
+        "expected_return_pct": round(expected_return * 100, 3) if expected_return is not None else None,
+        "expected_range_pct": expected_range,
+        "forecast_coverage": round(forecast_weight, 3),
+        "weighted_sentiment": round(weighted_sentiment, 3),
+        "annualized_volatility_pct": round(volatility * 100, 2) if volatility is not None else None,
+        "volatility_coverage": round(price_weight, 3),
+        "correlation": correlation,
+    }
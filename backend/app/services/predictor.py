@@ -2,98 +2,87 @@ import numpy as np
 import pandas as pd
 import xgboost as xgb
 from typing import Dict, List
+from numpy.lib.stride_tricks import sliding_window_view
+import os
+from .metrics import span, traced
+from .indicators import compute_indicators, get_indicators
+from .cache import get_cache, set_cache
 
 # ==========================================
 # 1. FEATURE ENGINEERING (Pure Technicals)
 # ==========================================
 
+# Indicators the model is trained on (the engine computes more for the chart/prompt)
+MODEL_FEATURES = ("rsi", "sma_dist", "volatility")
+
+# Using your Kaggle-validated hyperparameters
+DEFAULT_MODEL_PARAMS = {
+    "n_estimators": 500,
+    "learning_rate": 0.05,
+    "max_depth": 6,
+    "objective": "reg:squarederror",
+    "n_jobs": -1,
+    "random_state": 42,
+}
+
 def calculate_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """
     Computes Log Returns, RSI, Volatility, and SMA Distance.
+    DataFrame wrapper around the vectorized engine in indicators.py.
     """
     df = df.copy()
-    
-    # 1. Log Returns (The Target)
-    df['log_ret'] = np.log(df['close'] / df['close'].shift(1))
-    
-    # 2. Volatility (Risk)
-    df["volatility"] = df['log_ret'].rolling(window=5).std()
-    
-    # 3. RSI (Momentum)
-    delta = df['close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    df["rsi"] = 100 - (100 / (1 + rs))
-    
-    # 4. SMA Distance (Mean Reversion)
-    df["sma_dist"] = df['close'] / df['close'].rolling(window=10).mean() - 1
-
-    # Fill NaNs
-    df = df.fillna(0)
+    indicators = compute_indicators(df['close'].to_numpy(dtype=float), ("log_ret",) + MODEL_FEATURES)
+    for name in ("log_ret",) + MODEL_FEATURES:
+        df[name] = indicators[name]
     return df
 
 def build_features(df, lags=7):
     """
     Converts time-series into supervised learning format (X, y).
+    Accepts a DataFrame or a dict of indicator arrays.
+    Row i holds the `lags` returns before i plus the indicators at i; the target is the return at i+1.
     """
-    X, y = [], []
-    target_col = 'log_ret'
-    
-    for i in range(lags, len(df) - 1):
-        past_returns = df[target_col].iloc[i-lags:i].values.tolist()
-        
-        technical_features = [
-            df["rsi"].iloc[i],
-            df["sma_dist"].iloc[i],
-            df["volatility"].iloc[i]
-        ]
-        
-        features = past_returns + technical_features
-        target = df[target_col].iloc[i+1]
-        
-        X.append(features)
-        y.append(target)
-        
-    return np.array(X), np.array(y)
+    log_ret = np.asarray(df['log_ret'], dtype=float)
+    n = len(log_ret)
+    if n - 1 <= lags:
+        return np.empty((0, lags + len(MODEL_FEATURES))), np.empty(0)
+
+    idx = np.arange(lags, n - 1)
+    past_returns = sliding_window_view(log_ret, lags)[:len(idx)]
+    technical_features = np.column_stack([np.asarray(df[name], dtype=float)[idx] for name in MODEL_FEATURES])
+
+    X = np.hstack([past_returns, technical_features])
+    y = log_ret[idx + 1]
+    return X, y
 
 # ==========================================
 # 2. MAIN PREDICTION PIPELINE
 # ==========================================
 
-async def predict_prices(price_history: List[Dict], horizon_days=7, sentiment_score: float = 0.0):
+@traced("predict_prices")
+async def predict_prices(price_history: List[Dict], horizon_days=7, sentiment_score: float = 0.0, ticker: str = None, model_params: Dict = None):
     """
     Predicts future prices using XGBoost + Sentiment Adjustment Layer.
+    `model_params` overrides DEFAULT_MODEL_PARAMS (e.g. for backtesting faster configs).
     """
     # 1. Validation
     if not price_history or len(price_history) < 60:
         return {"error": "Not enough data (need > 60 days)"}
 
-    # 2. Convert to DataFrame
-    df = pd.DataFrame(price_history)
-    df['close'] = df['close'].astype(float)
-    
-    # 3. Apply Engineering
-    df_tech = calculate_technical_indicators(df)
+    # 2-3. Indicators (shared with the chart and prompt via the per-ticker cache)
+    ind = get_indicators(price_history, ticker)
     
     # 4. Build Dataset
     lags = 7
-    X, y = build_features(df_tech, lags=lags)
+    X, y = build_features(ind, lags=lags)
     
     if len(X) < 20:
         return {"error": "Not enough valid training samples"}
 
     # 5. Train Model (Pure Technicals)
-    # Using your Kaggle-validated hyperparameters
-    model = xgb.XGBRegressor(
-        n_estimators=500,
-        learning_rate=0.05,
-        max_depth=6,
-        objective="reg:squarederror",
-        n_jobs=-1,
-        random_state=42
-    )
-    model.fit(X, y)
+    model = xgb.XGBRegressor(**{**DEFAULT_MODEL_PARAMS, **(model_params or {})})
+    with span("xgboost_fit"):
+        model.fit(X, y)
 
     # 6. Calculate Uncertainty (Conformal Prediction)
     preds_train = model.predict(X)
@@ -102,15 +91,10 @@ async def predict_prices(price_history: List[Dict], horizon_days=7, sentiment_sc
 
     # 7. Recursive Forecast with Sentiment Adjustment
     future_prices = []
-    current_price = df_tech['close'].iloc[-1]
+    current_price = ind['close'][-1]
     
     # Build initial input vector
-    last_known_idx = -1
-    current_features = df_tech['log_ret'].iloc[-lags:].values.tolist() + [
-        df_tech['rsi'].iloc[last_known_idx],
-        df_tech['sma_dist'].iloc[last_known_idx],
-        df_tech['volatility'].iloc[last_known_idx]
-    ]
+    current_features = ind['log_ret'][-lags:].tolist() + [float(ind[name][-1]) for name in MODEL_FEATURES]
 
     # --- THE SENTIMENT BIAS FACTOR ---
     # We apply a small daily drift based on sentiment score (-1 to 1).
@@ -146,7 +130,7 @@ async def predict_prices(price_history: List[Dict], horizon_days=7, sentiment_sc
     lower_bound = final_price * np.exp(-uncertainty_margin * scaling_factor)
 
     return {
-        "current_price": df_tech['close'].iloc[-1],
+        "current_price": ind['close'][-1],
         "forecast_7d": round(final_price, 2),
         "forecast_range_low": round(lower_bound, 2),
         "forecast_range_high": round(upper_bound, 2),
@@ -155,23 +139,51 @@ async def predict_prices(price_history: List[Dict], horizon_days=7, sentiment_sc
         "plot_data": future_prices
     }
 
+# Forecasts are keyed by the last bar, so the TTL only bounds Redis memory
+FORECAST_TTL = int(os.getenv("FORECAST_TTL_SECONDS", "3600"))
+
+async def get_forecast(price_history: List[Dict], horizon_days=7, ticker: str = None, model_params: Dict = None):
+    """
+    predict_prices (no sentiment bias) behind a Redis cache shared by chat, report and portfolio.
+    `model_params` only tunes threading here, so it is not part of the key.
+    """
+    if not ticker or not price_history:
+        return await predict_prices(price_history, horizon_days, ticker=ticker, model_params=model_params)
+
+    last = price_history[-1]
+    cache_key = f"forecast_{ticker.upper()}_{horizon_days}_{last['date']}_{last['close']}_{len(price_history)}"
+    cached = get_cache(cache_key)
+    if cached:
+        return cached
+
+    prediction = await predict_prices(price_history, horizon_days, ticker=ticker, model_params=model_params)
+    if "error" not in prediction:
+        set_cache(cache_key, prediction, expire=FORECAST_TTL)
+    return prediction
+
 # ==========================================
 # 3. HELPER FOR FRONTEND CHART
 # ==========================================
 from datetime import datetime, timedelta
 
-def generate_chart_data(price_history, prediction_data):
+@traced("generate_chart_data")
+def generate_chart_data(price_history, prediction_data, ticker=None):
     chart_data = []
     history_slice = price_history[-60:] if len(price_history) > 60 else price_history
     last_date_str = None
+
+    # Reuses the forecaster's cached indicators for the RSI overlay
+    rsi = get_indicators(price_history, ticker).get("rsi") if price_history else None
+    offset = len(price_history) - len(history_slice)
     
-    for day in history_slice:
+    for i, day in enumerate(history_slice):
         chart_data.append({
             "date": day["date"],
             "price": day["close"],
             "type": "history",
             "lower": None,
-            "upper": None
+            "upper": None,
+            "rsi": round(float(rsi[offset + i]), 2) if rsi is not None else None
         })
         last_date_str = day["date"]
 
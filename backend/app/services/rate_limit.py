@@ -0,0 +1,53 @@
+import os
+import time
+import threading
+from .cache import cache
+
+# (calls, window seconds) per upstream, shared by the API and every worker.
+# NewsAPI's developer plan allows 100 requests/day; yfinance has no published
+# quota, so stay well under the rate Yahoo starts throttling at.
+UPSTREAM_LIMITS = {
+    "newsapi": (int(os.getenv("NEWSAPI_DAILY_LIMIT", "100")), 86400),
+    "yfinance": (int(os.getenv("YFINANCE_PER_MINUTE_LIMIT", "60")), 60),
+}
+
+# Share of each window the background refresher may spend; the rest is kept for user requests
+REFRESH_BUDGET_SHARE = float(os.getenv("REFRESH_BUDGET_SHARE", "0.5"))
+
+# Per-process fallback when Redis is not connected
+_local_counts = {}
+_local_lock = threading.Lock()
+
+
+def _window_key(source: str, now: float):
+    _, window = UPSTREAM_LIMITS[source]
+    return f"ratelimit_{source}_{int(now // window)}", window
+
+
+def note_upstream_call(source: str, calls: int = 1):
+    """Counts real upstream calls in the current fixed window. Returns the window's count."""
+    key, window = _window_key(source, time.time())
+    if cache:
+        pipe = cache.pipeline()
+        pipe.incrby(key, calls)
+        pipe.expire(key, window)
+        return pipe.execute()[0]
+
+    with _local_lock:
+        # Drop counts from past windows
+        for stale in [k for k in _local_counts if k[0] == source and k[1] != key]:
+            del _local_counts[stale]
+        _local_counts[(source, key)] = _local_counts.get((source, key), 0) + calls
+        return _local_counts[(source, key)]
+
+def get_usage(source: str):
+    """Upstream calls made in the current window."""
+    key, _ = _window_key(source, time.time())
+    if cache:
+        return int(cache.get(key) or 0)
+    return _local_counts.get((source, key), 0)
+
+def has_budget(source: str, calls: int = 1, share: float = REFRESH_BUDGET_SHARE):
+    """True if `calls` more requests fit in `share` of the source's window quota."""
+    limit, _ = UPSTREAM_LIMITS[source]
+    return get_usage(source) + calls <= limit * share
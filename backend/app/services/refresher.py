@@ -0,0 +1,172 @@
+"""
+Keeps the hottest tickers' market-data caches warm.
+
+Each cycle (the `refresh_hot_tickers` Celery beat task) takes the top
+HOT_TICKERS_TOP_N tickers by decayed request count and re-fetches every
+fundamentals/prices/news entry that expires within REFRESH_AHEAD_SECONDS,
+hottest first, while the shared upstream budget allows. The task then
+rebuilds report snapshots (sentiment + forecast) for tickers that had
+something refreshed and have every input cached.
+"""
+
+import asyncio
+import os
+import time
+from .cache import cache, get_ttl
+from .data_fetcher import (
+    fetch_fundamentals, fetch_price_history, fetch_news_docs,
+    fundamentals_key, price_history_key, news_key,
+)
+from .hot_tickers import top_tickers
+from .rate_limit import has_budget
+from .metrics import REFRESH_LAG_BUCKETS, traced
+
+HOT_TICKERS_TOP_N = int(os.getenv("HOT_TICKERS_TOP_N", "20"))
+# Must exceed REFRESH_INTERVAL_SECONDS plus one cycle's duration, or entries can expire between cycles
+REFRESH_AHEAD_SECONDS = int(os.getenv("REFRESH_AHEAD_SECONDS", "180"))
+# Upper bound on how long a crashed cycle blocks the next one (the task's hard time limit)
+REFRESH_LOCK_TTL = 300
+
+REFRESHER_STATS_KEY = "refresher_stats"
+# Cumulative refresh counts and lag histogram, exported by the API's /metrics
+REFRESHER_TOTALS_KEY = "refresher_totals"
+REFRESHER_LOCK_KEY = "refresher_lock"
+
+SOURCES = ("fundamentals", "prices", "news")
+
+
+def _sources(ticker: str):
+    """source -> (cache key, fetcher, upstream, upstream calls per fetch)"""
+    return {
+        "fundamentals": (fundamentals_key(ticker), fetch_fundamentals, "yfinance", 2),
+        "prices": (price_history_key(ticker), fetch_price_history, "yfinance", 1),
+        "news": (news_key(ticker), fetch_news_docs, "newsapi", 1),
+    }
+
+def inputs_warm(ticker: str):
+    """True if every report input is cached, so building a snapshot makes no upstream call."""
+    return all(get_ttl(key) is not None for key, *_ in _sources(ticker).values())
+
+def _record_refresh(source: str, result: str, lag: float = None):
+    pipe = cache.pipeline()
+    pipe.hincrby(REFRESHER_TOTALS_KEY, f"refreshes|{source}|{result}", 1)
+    if lag is not None:
+        for le in REFRESH_LAG_BUCKETS:
+            if lag <= le:
+                pipe.hincrby(REFRESHER_TOTALS_KEY, f"lag_bucket|{source}|{le}", 1)
+        pipe.hincrbyfloat(REFRESHER_TOTALS_KEY, f"lag_sum|{source}", lag)
+        pipe.hincrby(REFRESHER_TOTALS_KEY, f"lag_count|{source}", 1)
+    pipe.execute()
+
+def _load_totals():
+    totals = {"refreshes": {}, "lag": {}}
+    for field, value in cache.hgetall(REFRESHER_TOTALS_KEY).items():
+        kind, source, *rest = field.split("|")
+        if kind == "refreshes":
+            totals["refreshes"][(source, rest[0])] = int(value)
+            continue
+        hist = totals["lag"].setdefault(source, {"buckets": {}, "sum": 0.0, "count": 0})
+        if kind == "lag_bucket":
+            hist["buckets"][int(rest[0])] = int(value)
+        elif kind == "lag_sum":
+            hist["sum"] = float(value)
+        elif kind == "lag_count":
+            hist["count"] = int(value)
+    return totals
+
+def _is_error(data):
+    if isinstance(data, dict):
+        return "error" in data
+    return not data or (isinstance(data[0], dict) and "error" in data[0])
+
+
+async def refresh_ticker(ticker: str, stats: dict):
+    """Re-fetches the ticker's entries that are missing or due. Returns the refreshed sources."""
+    plan = {}
+    reserved = {}
+    for source, (key, fetch, upstream, calls) in _sources(ticker).items():
+        remaining = get_ttl(key)
+        if remaining is not None and remaining > REFRESH_AHEAD_SECONDS:
+            continue
+        if not has_budget(upstream, reserved.get(upstream, 0) + calls):
+            _record_refresh(source, "rate_limited")
+            stats["rate_limited"] += 1
+            continue
+        reserved[upstream] = reserved.get(upstream, 0) + calls
+        plan[source] = (fetch, remaining)
+
+    results = await asyncio.gather(
+        *(fetch(ticker, refresh=True) for fetch, _ in plan.values()),
+        return_exceptions=True,
+    )
+
+    refreshed = []
+    for (source, (_, remaining)), data in zip(plan.items(), results):
+        if isinstance(data, Exception) or _is_error(data):
+            _record_refresh(source, "error")
+            stats["errors"] += 1
+            continue
+
+        if remaining is None:
+            # Expired before the refresher got to it: requests in between saw a cold cache
+            _record_refresh(source, "cold")
+            stats["cold"] += 1
+        else:
+            lag = max(0.0, REFRESH_AHEAD_SECONDS - remaining)
+            _record_refresh(source, "ok", lag)
+            stats["max_lag_seconds"] = max(stats["max_lag_seconds"], lag)
+        stats["refreshed"] += 1
+        refreshed.append(source)
+    return refreshed
+
+@traced("refresh_hot_tickers")
+async def refresh_hot_tickers(top_n: int = HOT_TICKERS_TOP_N):
+    """
+    Runs one refresh cycle over the hot tickers.
+    Returns {ticker: [refreshed sources]}, or None if skipped (no Redis, or another cycle is running).
+    """
+    if not cache:
+        return None
+    if not cache.set(REFRESHER_LOCK_KEY, 1, nx=True, ex=REFRESH_LOCK_TTL):
+        return None
+
+    try:
+        start = time.time()
+        hot = [ticker for ticker, _ in top_tickers(top_n)]
+        stats = {"refreshed": 0, "rate_limited": 0, "cold": 0, "errors": 0, "max_lag_seconds": 0.0}
+
+        refreshed = {}
+        # Hottest first, so a tight upstream budget goes to the most requested tickers
+        for ticker in hot:
+            refreshed[ticker] = await refresh_ticker(ticker, stats)
+
+        stats.update(hot_tickers=len(hot), cycle_seconds=round(time.time() - start, 3), finished_at=time.time())
+        cache.hset(REFRESHER_STATS_KEY, mapping=stats)
+        return refreshed
+    finally:
+        cache.delete(REFRESHER_LOCK_KEY)
+
+
+def refresher_status(top_n: int = HOT_TICKERS_TOP_N):
+    """
+    For /metrics: the last cycle's summary, the hot tickers' live cache state and the
+    cumulative totals, {"last_cycle": {field: value}, "entries": {source: {"cold": n,
+    "min_ttl": seconds or None}}, "totals": {"refreshes": {(source, result): n}, "lag": {source: histogram}}}.
+    """
+    if not cache:
+        return None
+
+    last_cycle = {k: float(v) for k, v in cache.hgetall(REFRESHER_STATS_KEY).items()}
+    if "finished_at" in last_cycle:
+        last_cycle["age_seconds"] = round(time.time() - last_cycle.pop("finished_at"), 3)
+
+    hot = [ticker for ticker, _ in top_tickers(top_n)]
+    entries = {}
+    for source in SOURCES:
+        ttls = [get_ttl(_sources(ticker)[source][0]) for ticker in hot]
+        live = [t for t in ttls if t is not None and t != float("inf")]
+        entries[source] = {
+            "cold": sum(t is None for t in ttls),
+            "min_ttl": min(live) if live else None,
+        }
+    return {"last_cycle": last_cycle, "entries": entries, "totals": _load_totals()}
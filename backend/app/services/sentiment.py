@@ -2,6 +2,7 @@
 
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import torch
+from .metrics import traced
 
 # Load FinBERT model from Hugging Face
 MODEL_NAME = "yiyanghkust/finbert-tone"
@@ -11,31 +12,31 @@ model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
 # Label mapping for FinBERT
 id2label = {0: "neutral", 1: "positive", 2: "negative"}
 
-def compute_sentiment(news_docs):
-    """
-    Compute average sentiment using FinBERT for finance-specific text.
-    Returns average polarity and counts of each sentiment label.
-    """
-    if not isinstance(news_docs, list) or len(news_docs) == 0:
-        return {"average_sentiment": 0, "label_distribution": {}, "note": "no news data"}
+# Articles per FinBERT forward pass
+BATCH_SIZE = 32
 
-    scores = []
-    labels = {"positive": 0, "negative": 0, "neutral": 0}
+def _article_text(article):
+    return ((article.get("title") or "") + " " + (article.get("content") or "")).strip()
 
-    for article in news_docs:
-        text = ((article.get("title") or "") + " " + (article.get("content") or "")).strip()
-        if not text:
-            continue
-
-        # Tokenize and run through FinBERT
-        inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True, max_length=128)
+def _score_texts(texts):
+    """Runs FinBERT over texts in padded batches. Returns [(label, confidence)]."""
+    results = []
+    for i in range(0, len(texts), BATCH_SIZE):
+        inputs = tokenizer(texts[i:i + BATCH_SIZE], return_tensors="pt", truncation=True, padding=True, max_length=128)
         with torch.no_grad():
             outputs = model(**inputs)
             probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
-            pred = torch.argmax(probs, dim=1).item()
-            label = id2label[pred]
-            confidence = probs[0][pred].item()
+            confidences, preds = torch.max(probs, dim=1)
+        results.extend((id2label[p], c) for p, c in zip(preds.tolist(), confidences.tolist()))
+    return results
+
+def _aggregate(scored):
+    labels = {"positive": 0, "negative": 0, "neutral": 0}
+    if not scored:
+        return {"average_sentiment": 0, "label_distribution": labels}
 
+    scores = []
+    for label, confidence in scored:
         # Map to numerical sentiment score for averaging
         if label == "positive":
             val = confidence
@@ -47,12 +48,48 @@ def compute_sentiment(news_docs):
         scores.append(val)
         labels[label] += 1
 
-    # Compute average sentiment value
-    if not scores:
-        return {"average_sentiment": 0, "label_distribution": labels}
-
     avg = sum(scores) / len(scores)
     return {
         "average_sentiment": round(avg, 3),
         "label_distribution": labels,
     }
+
+@traced("compute_sentiment")
+def compute_sentiment(news_docs):
+    """
+    Compute average sentiment using FinBERT for finance-specific text.
+    Returns average polarity and counts of each sentiment label.
+    """
+    if not isinstance(news_docs, list) or len(news_docs) == 0:
+        return {"average_sentiment": 0, "label_distribution": {}, "note": "no news data"}
+
+    texts = [t for t in (_article_text(a) for a in news_docs) if t]
+    return _aggregate(_score_texts(texts))
+
+@traced("compute_sentiment_batch")
+def compute_sentiment_batch(news_by_ticker):
+    """
+    Scores several tickers' news in one batched FinBERT pass.
+    Returns {ticker: compute_sentiment-style result}.
+    """
+    owners, texts = [], []
+    for ticker, news_docs in news_by_ticker.items():
+        if not isinstance(news_docs, list):
+            continue
+        for article in news_docs:
+            text = _article_text(article)
+            if text:
+                owners.append(ticker)
+                texts.append(text)
+
+    scored_by_ticker = {ticker: [] for ticker in news_by_ticker}
+    for ticker, scored in zip(owners, _score_texts(texts)):
+        scored_by_ticker[ticker].append(scored)
+
+    results = {}
+    for ticker, news_docs in news_by_ticker.items():
+        if not isinstance(news_docs, list) or len(news_docs) == 0:
+            results[ticker] = {"average_sentiment": 0, "label_distribution": {}, "note": "no news data"}
+        else:
+            results[ticker] = _aggregate(scored_by_ticker[ticker])
+    return results
@@ -1,13 +1,98 @@
-from .celery_app import app
+from .celery_app import app, REFRESH_INTERVAL
 from .rag.ingest import ingest_news_for_ticker
+from .services.ingest_tracker import is_stale, get_inflight, claim_ingest, release_ingest, mark_ingested
 import asyncio
+import uuid
 
-@app.task(name="ingest_ticker_news")
-def task_ingest_news(ticker: str):
+
+def run_async(coro):
+    """
+    Runs a task's coroutine on a fresh event loop. Every task goes through here:
+    once asyncio.run has closed a loop, asyncio.get_event_loop() raises in the
+    same worker process.
+    """
+    return asyncio.run(coro)
+
+
+@app.task(name="ingest_ticker_news", bind=True, soft_time_limit=60, time_limit=90)
+def task_ingest_news(self, ticker: str):
     print(f"Worker: Starting ingestion for {ticker}...")
-    
-    loop = asyncio.get_event_loop()
-    result = loop.run_until_complete(ingest_news_for_ticker(ticker))
-    
+
+    try:
+        result = run_async(ingest_news_for_ticker(ticker))
+        # Failed ingestions stay stale, so the next request retries them
+        if result.get("status") != "error":
+            mark_ingested(ticker)
+    finally:
+        release_ingest(ticker, self.request.id)
+
     print(f"Worker: Finished ingestion for {ticker}")
-    return result
\ No newline at end of file
+    return result
+
+
+@app.task(name="refresh_hot_tickers", soft_time_limit=240, time_limit=300)
+def task_refresh_hot_tickers():
+    from .services.refresher import refresh_hot_tickers
+    refreshed = run_async(refresh_hot_tickers())
+    if refreshed is None:
+        return None
+
+    for ticker, sources in refreshed.items():
+        if not sources:
+            continue
+        if "news" in sources:
+            # Embeds the articles just cached, without another NewsAPI call
+            schedule_ingest(ticker, force=True)
+        # Expires so a slow queue can't pile them up
+        task_build_report_snapshot.apply_async(args=[ticker], expires=REFRESH_INTERVAL)
+    return refreshed
+
+
+@app.task(name="build_report_snapshot", soft_time_limit=120, time_limit=180)
+def task_build_report_snapshot(ticker: str, horizon_days: int = 7):
+    from .api.report import generate_report
+    from .services.refresher import inputs_warm
+    # A missing input (e.g. skipped as rate-limited) would be fetched outside the refresher's budget
+    if not inputs_warm(ticker):
+        return None
+    report = run_async(generate_report(ticker, horizon_days))
+    return report["data_version"]
+
+
+def schedule_ingest(ticker: str, force: bool = False):
+    """
+    Enqueues a news ingestion only if the ticker's news is stale (or `force`),
+    with at most one ingestion in flight per ticker.
+    Returns the AsyncResult of the new or already-running task, or None if fresh.
+    """
+    ticker = ticker.upper()
+
+    inflight_id = get_inflight(ticker)
+    if inflight_id:
+        return task_ingest_news.AsyncResult(inflight_id)
+
+    if not force and not is_stale(ticker):
+        return None
+
+    task_id = str(uuid.uuid4())
+    if not claim_ingest(ticker, task_id):
+        # Lost the race to another request
+        inflight_id = get_inflight(ticker)
+        return task_ingest_news.AsyncResult(inflight_id) if inflight_id else None
+
+    return task_ingest_news.apply_async(args=[ticker], task_id=task_id)
+
+
+async def wait_for_task(result, timeout: float = 30, poll_interval: float = 0.5):
+    """
+    Polls the result backend without blocking the event loop.
+    Returns True if the task finished successfully within `timeout`.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    while loop.time() < deadline:
+        if await asyncio.to_thread(result.ready):
+            return result.successful()
+        await asyncio.sleep(poll_interval)
+    return False
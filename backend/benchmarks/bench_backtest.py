@@ -0,0 +1,65 @@
+"""
+Walk-forward backtest of predict_prices across model configs: MAE, direction
+accuracy, 90% interval coverage and folds/sec.
+
+    cd backend
+    python -m benchmarks.bench_backtest --prices data/prices --folds 20 --configs baseline,hist
+    python -m benchmarks.bench_backtest                       # fixture tickers, 3 years of bars
+
+--prices takes a directory of <TICKER>.csv (Date, Close) or <TICKER>.json
+([{date, close}]) files.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+
+from .common import enable_fixture_mode, write_results
+
+enable_fixture_mode()
+
+from app.services.backtest import MODEL_CONFIGS, run_backtest  # noqa: E402
+from app.services.fixtures import fake_price_history  # noqa: E402
+
+FIXTURE_TICKERS = ["AAPL", "MSFT", "NVDA", "AMZN"]
+
+
+def fixture_price_files(days=3 * 365):
+    out_dir = tempfile.mkdtemp(prefix="backtest_prices_")
+    files = {}
+    for ticker in FIXTURE_TICKERS:
+        path = os.path.join(out_dir, f"{ticker}.json")
+        with open(path, "w") as f:
+            json.dump(fake_price_history(ticker, days), f)
+        files[ticker] = path
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prices", help="directory of <TICKER>.csv/.json price files (default: fixtures)")
+    parser.add_argument("--configs", default=",".join(MODEL_CONFIGS), help=f"comma-separated, from {list(MODEL_CONFIGS)}")
+    parser.add_argument("--folds", type=int, default=20, help="folds per ticker")
+    parser.add_argument("--horizon", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", help="result file (default: benchmarks/results/backtest-<timestamp>.json)")
+    args = parser.parse_args()
+
+    if args.prices:
+        files = {
+            os.path.splitext(name)[0].upper(): os.path.join(args.prices, name)
+            for name in sorted(os.listdir(args.prices))
+            if name.endswith((".csv", ".json"))
+        }
+    else:
+        files = fixture_price_files()
+
+    results = run_backtest(files, args.configs.split(","), horizon=args.horizon, n_folds=args.folds, workers=args.workers)
+    for r in results:
+        print(json.dumps(r))
+    write_results("backtest", results, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Celery load test against an in-memory broker: tasks/sec for each worker profile.
+
+    cd backend
+    python -m benchmarks.bench_celery --tasks 200
+
+Each profile's concurrency and prefetch settings are applied to an embedded
+worker. The in-memory transport cannot cross process boundaries, so the
+worker uses the threads pool. Task bodies sleep for a per-queue service time
+(torch and xgboost release the GIL during inference/training, so this
+approximates the real mix without loading models).
+
+These are thread-pool numbers (results carry "pool": "threads"): they compare
+concurrency/prefetch settings, not prefork start-up, memory or per-child
+model loading, which only a real broker and prefork workers can measure.
+"""
+
+import argparse
+import json
+import time
+from contextlib import contextmanager
+
+from celery.contrib.testing.worker import start_worker
+from kombu.transport import memory
+
+from .common import write_results
+from app.celery_app import app, WORKER_PROFILES, QUEUE_INGESTION, QUEUE_TRAINING
+
+# Simulated per-task service time (seconds)
+SERVICE_TIME = {
+    QUEUE_INGESTION: 0.05,
+    QUEUE_TRAINING: 0.10,
+}
+
+POOL = "threads"
+
+
+def use_in_memory_broker():
+    app.conf.update(
+        broker_url="memory://",
+        result_backend="cache+memory://",
+        broker_transport_options={"polling_interval": 0.005},
+        task_routes={},
+    )
+
+
+@contextmanager
+def fast_memory_drain():
+    """
+    The in-memory transport runs in Celery's synchronous consumer loop, which
+    drains with a 2s timeout and only refreshes QoS between drains. Clamp it so
+    prefetch slots refill promptly, as they do under the AMQP/Redis event loop.
+    Restored on exit so the patch never outlives the run.
+    """
+    drain_events = memory.Transport.drain_events
+
+    def _fast_drain_events(self, connection, timeout=None):
+        return drain_events(self, connection, timeout=min(timeout or 0.01, 0.01))
+
+    memory.Transport.drain_events = _fast_drain_events
+    try:
+        yield
+    finally:
+        memory.Transport.drain_events = drain_events
+
+
+@app.task(name="bench.work")
+def bench_work(seconds: float):
+    time.sleep(seconds)
+    return seconds
+
+
+def run_profile(name, profile, n_tasks):
+    queues = profile["queues"]
+    app.conf.update(
+        worker_prefetch_multiplier=profile["prefetch_multiplier"],
+        worker_concurrency=profile["concurrency"],
+    )
+
+    with fast_memory_drain(), start_worker(
+        app,
+        pool=POOL,
+        concurrency=profile["concurrency"],
+        queues=queues,
+        perform_ping_check=False,
+        shutdown_timeout=30,
+    ):
+        start = time.perf_counter()
+        results = [
+            bench_work.apply_async(args=[SERVICE_TIME[queues[i % len(queues)]]], queue=queues[i % len(queues)])
+            for i in range(n_tasks)
+        ]
+        for r in results:
+            r.get(timeout=120, interval=0.005)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "name": name,
+        "pool": POOL,
+        "queues": queues,
+        "concurrency": profile["concurrency"],
+        "prefetch_multiplier": profile["prefetch_multiplier"],
+        "tasks": n_tasks,
+        "seconds": round(elapsed, 3),
+        "tasks_per_sec": round(n_tasks / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--profile", choices=list(WORKER_PROFILES), help="run a single profile")
+    parser.add_argument("--out", help="result file (default: benchmarks/results/celery-<timestamp>.json)")
+    args = parser.parse_args()
+
+    use_in_memory_broker()
+    names = [args.profile] if args.profile else list(WORKER_PROFILES)
+    results = []
+    for name in names:
+        results.append(run_profile(name, WORKER_PROFILES[name], args.tasks))
+        print(json.dumps(results[-1]))
+    write_results("celery", results, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+HTTP load test for /api/chat and /api/report: throughput and p50/p95/p99.
+
+    cd backend
+    python -m benchmarks.bench_http --requests 100 --concurrency 8 [--out results.json]
+
+By default the app runs in-process (ASGI transport) in FAKE_DATA mode, with
+fixture news pre-ingested so chats never wait on Celery. Pass --url to load
+test a running server instead.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from .common import enable_fixture_mode, summarize, write_results
+
+TICKERS = ["AAPL", "MSFT", "NVDA", "AMZN"]
+QUESTIONS = [
+    "Should I buy now?",
+    "What are the main risks?",
+    "How has the antitrust probe affected the outlook?",
+    "Is the stock overvalued after the buyback?",
+]
+
+
+def chat_body(i):
+    return {"user_input": QUESTIONS[i % len(QUESTIONS)], "ticker": TICKERS[i % len(TICKERS)], "horizon_days": 7}
+
+
+def report_body(i):
+    return {"ticker": TICKERS[i % len(TICKERS)], "horizon_days": 7}
+
+
+async def load(client, path, make_body, n_requests, concurrency):
+    latencies, errors = [], 0
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        nonlocal errors
+        async with sem:
+            start = time.perf_counter()
+            resp = await client.post(path, json=make_body(i))
+            latencies.append((time.perf_counter() - start) * 1000)
+            if resp.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n_requests)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "name": f"POST {path}",
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_per_sec": round(n_requests / elapsed, 2),
+        **summarize(latencies),
+    }
+
+
+async def prepare_fixtures():
+    from app.rag.ingest import ingest_news_for_ticker
+    from app.services.ingest_tracker import mark_ingested
+
+    for ticker in TICKERS:
+        await ingest_news_for_ticker(ticker)
+        mark_ingested(ticker)
+
+
+async def run(args):
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=120)
+    else:
+        from app.main import app
+
+        await prepare_fixtures()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120)
+
+    async with client:
+        # Warm caches and models once per ticker
+        for i in range(len(TICKERS)):
+            await client.post("/api/report", json=report_body(i))
+
+        return [
+            await load(client, "/api/chat", chat_body, args.requests, args.concurrency),
+            await load(client, "/api/report", report_body, args.requests, args.concurrency),
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--url", help="load test a running server instead of the in-process app")
+    parser.add_argument("--out", help="result file (default: benchmarks/results/http-<timestamp>.json)")
+    args = parser.parse_args()
+
+    if not args.url:
+        enable_fixture_mode()
+
+    results = asyncio.run(run(args))
+    for r in results:
+        print(json.dumps(r))
+    write_results("http", results, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Micro-benchmarks over deterministic fixtures (FAKE_DATA mode):
+build_features, predict_prices, compute_sentiment, generate_chart_data and retrieval.
+
+    cd backend
+    python -m benchmarks.bench_micro --repeat 20 [--out results.json]
+"""
+
+import argparse
+import asyncio
+import json
+
+from .common import enable_fixture_mode, time_call, write_results
+
+enable_fixture_mode()
+
+import pandas as pd  # noqa: E402
+
+from app.services.fixtures import fake_news_docs, fake_price_history  # noqa: E402
+from app.services.predictor import build_features, calculate_technical_indicators, generate_chart_data, predict_prices  # noqa: E402
+
+TICKER = "AAPL"
+
+
+def bench_predictor(repeat):
+    prices = fake_price_history(TICKER)
+    df = pd.DataFrame(prices)
+    df_tech = calculate_technical_indicators(df)
+    prediction = asyncio.run(predict_prices(prices, 7))
+
+    return [
+        {"name": "calculate_technical_indicators", **time_call(lambda: calculate_technical_indicators(df), repeat)},
+        {"name": "build_features", **time_call(lambda: build_features(df_tech, lags=7), repeat)},
+        {"name": "predict_prices", **time_call(lambda: asyncio.run(predict_prices(prices, 7)), max(3, repeat // 4))},
+        {"name": "generate_chart_data", **time_call(lambda: generate_chart_data(prices, prediction), repeat)},
+    ]
+
+
+def bench_sentiment(repeat):
+    try:
+        from app.services.sentiment import compute_sentiment
+    except Exception as e:
+        print(f"Skipping compute_sentiment (FinBERT unavailable): {e}")
+        return []
+
+    news = fake_news_docs(TICKER)
+    return [{"name": "compute_sentiment[25 docs]", **time_call(lambda: compute_sentiment(news), max(3, repeat // 4))}]
+
+
+def bench_retrieval(repeat):
+    from app.rag.ingest import ingest_news_for_ticker
+    from app.rag.vector_store import retrieve
+
+    asyncio.run(ingest_news_for_ticker(TICKER))
+    collection = f"news_{TICKER.lower()}"
+    query = "What are the main risks from the antitrust probe?"
+
+    return [
+        {"name": "retrieve[hybrid]", **time_call(lambda: retrieve(query, k=5, collection=collection, use_rerank=False), repeat)},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--out", help="result file (default: benchmarks/results/micro-<timestamp>.json)")
+    args = parser.parse_args()
+
+    results = bench_predictor(args.repeat) + bench_sentiment(args.repeat) + bench_retrieval(args.repeat)
+    for r in results:
+        print(json.dumps(r))
+    write_results("micro", results, args.out)
+
+
+if __name__ == "__main__":
+    main()
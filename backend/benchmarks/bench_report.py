@@ -0,0 +1,81 @@
+"""
+/api/report wire-size and latency benchmark against a running server.
+
+    cd backend
+    python -m benchmarks.bench_report --url http://localhost:8000 --ticker AAPL
+
+Reports bytes on the wire and p50 latency for the first (cold) call and for
+warm calls with identity/gzip/br encodings, a field projection and ETag
+revalidation (304).
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import httpx
+
+from .common import write_results
+
+PROJECTION = ["fundamentals", "sentiment", "prediction"]
+
+
+def measure(client, url, body, headers, n):
+    latencies, sizes, statuses = [], [], set()
+    for _ in range(n):
+        start = time.perf_counter()
+        with client.stream("POST", url, json=body, headers=headers) as resp:
+            for _chunk in resp.iter_raw():
+                pass
+            sizes.append(resp.num_bytes_downloaded)
+            statuses.add(resp.status_code)
+            etag = resp.headers.get("etag")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {
+        "bytes_on_wire": int(statistics.median(sizes)),
+        "latency_p50_ms": round(statistics.median(latencies), 2),
+        "status": sorted(statuses),
+    }, etag
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--ticker", default="AAPL")
+    parser.add_argument("--horizon", type=int, default=7)
+    parser.add_argument("-n", type=int, default=20, help="warm requests per scenario")
+    parser.add_argument("--out", help="result file (default: benchmarks/results/report-<timestamp>.json)")
+    args = parser.parse_args()
+
+    url = f"{args.url}/api/report"
+    body = {"ticker": args.ticker, "horizon_days": args.horizon}
+    identity = {"Accept-Encoding": "identity"}
+
+    with httpx.Client(timeout=120) as client:
+        cold, _ = measure(client, url, body, identity, 1)
+        results = [{"name": "cold/full/identity", **cold}]
+        print(json.dumps(results[-1]))
+
+        scenarios = [
+            ("warm/full/identity", body, identity),
+            ("warm/full/gzip", body, {"Accept-Encoding": "gzip"}),
+            ("warm/full/br", body, {"Accept-Encoding": "br"}),
+            ("warm/projected/br", {**body, "fields": PROJECTION}, {"Accept-Encoding": "br"}),
+        ]
+        etag = None
+        for name, req_body, headers in scenarios:
+            result, etag = measure(client, url, req_body, headers, args.n)
+            results.append({"name": name, **result})
+            print(json.dumps(results[-1]))
+
+        # Revalidate the last scenario with its ETag
+        result, _ = measure(client, url, scenarios[-1][1], {**scenarios[-1][2], "If-None-Match": etag or ""}, args.n)
+        results.append({"name": "warm/projected/304", **result})
+        print(json.dumps(results[-1]))
+
+    write_results("report", results, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Retrieval benchmark: recall@k and latency for BM25, dense and hybrid search
+over the fixture news corpus.
+
+    cd backend
+    python -m benchmarks.bench_retrieval --k 5 [--rerank]
+
+Runs in FAKE_DATA mode by default, so dense search uses the local hashing
+embeddings; set FAKE_DATA=0 with HUGGINGFACEHUB_API_TOKEN to measure the
+production embedding model.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+from .common import enable_fixture_mode, write_results
+
+enable_fixture_mode()
+
+from langchain_chroma import Chroma  # noqa: E402
+
+from app.rag.lexical_index import BM25Index  # noqa: E402
+from app.rag.vector_store import docs_from_news, get_cross_encoder, get_embeddings, hybrid_rank  # noqa: E402
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "news_corpus.json")
+
+
+def load_fixture(path=FIXTURE_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def run_mode(name, search_fn, queries, k):
+    recalls, latencies = [], []
+    for q in queries:
+        start = time.perf_counter()
+        docs = search_fn(q["query"])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        found = {d.metadata.get("url") for d in docs[:k]}
+        relevant = set(q["relevant"])
+        recalls.append(len(found & relevant) / len(relevant))
+
+    return {
+        "name": name,
+        f"recall@{k}": round(statistics.mean(recalls), 3),
+        "latency_p50_ms": round(statistics.median(latencies), 2),
+        "latency_max_ms": round(max(latencies), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--rerank", action="store_true", help="also measure hybrid + cross-encoder")
+    parser.add_argument("--out", help="result file (default: benchmarks/results/retrieval-<timestamp>.json)")
+    args = parser.parse_args()
+
+    fixture = load_fixture()
+    docs, ids = docs_from_news(fixture["articles"])
+    queries = fixture["queries"]
+    k, fetch_k = args.k, max(args.k * 3, 20)
+
+    index = BM25Index()
+    index.add_documents(docs, ids)
+
+    results = [
+        run_mode("bm25", lambda q: hybrid_rank(q, [], index, k=k, fetch_k=fetch_k, use_rerank=False), queries, k)
+    ]
+
+    embeddings = get_embeddings()
+    if embeddings:
+        vs = Chroma(collection_name=f"bench_{fixture['collection']}", embedding_function=embeddings)
+        vs.add_documents(documents=docs, ids=ids)
+
+        results.append(run_mode("dense", lambda q: vs.similarity_search(q, k=k), queries, k))
+        results.append(run_mode(
+            "hybrid",
+            lambda q: hybrid_rank(q, vs.similarity_search(q, k=fetch_k), index, k=k, fetch_k=fetch_k, use_rerank=False),
+            queries, k,
+        ))
+        if args.rerank:
+            # rerank() skips until the model is loaded; load it up front to time the warm path
+            get_cross_encoder()
+            results.append(run_mode(
+                "hybrid+rerank",
+                lambda q: hybrid_rank(q, vs.similarity_search(q, k=fetch_k), index, k=k, fetch_k=fetch_k, use_rerank=True),
+                queries, k,
+            ))
+        vs.delete_collection()
+    else:
+        print("Embeddings unavailable: skipping dense and hybrid modes.")
+
+    for r in results:
+        print(json.dumps(r))
+    write_results("retrieval", results, args.out)
+
+
+if __name__ == "__main__":
+    main()
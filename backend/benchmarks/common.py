@@ -0,0 +1,84 @@
+"""
+Shared helpers for the benchmark suite: fixture-mode setup, percentile
+summaries and JSON result files that `benchmarks.compare` can diff.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def enable_fixture_mode():
+    """
+    Points the app at offline fixtures. Must run before any `app.*` import,
+    since settings are read at import time. Explicit env vars still win.
+    """
+    os.environ.setdefault("FAKE_DATA", "1")
+    os.environ.setdefault("CELERY_BROKER_URL", "memory://")
+    os.environ.setdefault("CELERY_RESULT_BACKEND", "cache+memory://")
+    os.environ.setdefault("REDIS_URL", "redis://127.0.0.1:1/0")
+    os.environ.setdefault("CHROMA_PERSIST_DIR", tempfile.mkdtemp(prefix="bench_chroma_"))
+    os.environ.pop("CHROMA_DB_HOST", None)
+
+
+def summarize(latencies_ms):
+    ordered = sorted(latencies_ms)
+
+    def pct(p):
+        return round(ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))], 3)
+
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.mean(ordered), 3),
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+    }
+
+
+def time_call(fn, repeat=20, warmup=1):
+    """Runs fn() `repeat` times after `warmup` runs and summarizes latency."""
+    for _ in range(warmup):
+        fn()
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return summarize(latencies)
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def write_results(benchmark: str, results: list, out: str = None):
+    """Writes results as JSON (default: benchmarks/results/<benchmark>-<timestamp>.json)."""
+    if out is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        out = os.path.join(RESULTS_DIR, f"{benchmark}-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json")
+
+    payload = {
+        "benchmark": benchmark,
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "fake_data": os.getenv("FAKE_DATA", "0"),
+        "results": results,
+    }
+    with open(out, "w") as f:
+        json.dump(payload, f, indent=2)
+    print(f"Results written to {out}")
+    return out
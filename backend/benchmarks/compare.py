@@ -0,0 +1,61 @@
+"""
+Compares two benchmark result files and flags regressions.
+
+    cd backend
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.10
+
+Latency metrics (*_ms) regress when they grow, throughput metrics (*_per_sec)
+when they shrink, by more than the threshold. Exits 1 if anything regressed.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        return {r["name"]: r for r in json.load(f)["results"]}
+
+
+def compare(baseline, candidate, threshold):
+    rows, regressions = [], 0
+    for name, new in candidate.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        for metric, new_value in new.items():
+            old_value = old.get(metric)
+            if not isinstance(new_value, (int, float)) or not old_value:
+                continue
+            if metric.endswith("_ms"):
+                change = new_value / old_value - 1
+            elif metric.endswith("_per_sec"):
+                change = old_value / new_value - 1 if new_value else float("inf")
+            else:
+                continue
+
+            regressed = change > threshold
+            regressions += regressed
+            rows.append((name, metric, old_value, new_value, change, regressed))
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    rows, regressions = compare(load(args.baseline), load(args.candidate), args.threshold)
+    for name, metric, old, new, change, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:40s} {metric:20s} {old:>12} -> {new:<12} {change:+7.1%} {flag}")
+
+    print(f"\n{regressions} regression(s) above {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()